@@ -1,21 +1,18 @@
-from langchain_core.prompts import PromptTemplate
-from langchain_openai import ChatOpenAI
+import hashlib
+import json
 import os
+import threading
 
+from ai.prompt_encoder import encode_audit_for_prompt, estimate_tokens
+from utils.disk_cache import CACHE_DIR, DiskCache
 
-def generate_ai_audit(audit_results, final_score, grade):
-    llm = ChatOpenAI(
-        model="gpt-4o-mini",
-        temperature=0.2,
-        api_key=os.getenv("OPENAI_API_KEY"),
-    )
+MODEL = "gpt-4o-mini"
+TEMPERATURE = 0.2
 
-    prompt = PromptTemplate(
-        input_variables=["audit", "score", "grade"],
-        template="""
+PROMPT_TEMPLATE = """
 You are a senior digital marketing auditor.
 
-Website audit data:
+Website audit data (compact JSON):
 {audit}
 
 Final Score: {score}/100
@@ -27,14 +24,213 @@ Give:
 3. Top 3 weaknesses
 4. Actionable recommendations
 """
+
+# Identical audits reuse the stored summary for this long (seconds, default 7 days)
+AI_CACHE_TTL = int(os.getenv("AI_CACHE_TTL", str(7 * 24 * 60 * 60)))
+AI_CACHE_MAX_ENTRIES = int(os.getenv("AI_CACHE_MAX_ENTRIES", "5000"))
+
+# Parallel LLM requests in batch summarization (tune to the provider's rate limits)
+AI_BATCH_CONCURRENCY = int(os.getenv("AI_BATCH_CONCURRENCY", "8"))
+
+_chain = None
+_cache = None
+_lock = threading.Lock()
+
+
+def _get_chain():
+    """
+    Builds the prompt | llm chain once per process and reuses it.
+    LangChain is imported here so importing this module stays cheap.
+    """
+    global _chain
+    with _lock:
+        if _chain is None:
+            from langchain_core.prompts import PromptTemplate
+            from langchain_openai import ChatOpenAI
+
+            llm = ChatOpenAI(
+                model=MODEL,
+                temperature=TEMPERATURE,
+                api_key=os.getenv("OPENAI_API_KEY"),
+            )
+
+            prompt = PromptTemplate(
+                input_variables=["audit", "score", "grade"],
+                template=PROMPT_TEMPLATE
+            )
+
+            _chain = prompt | llm
+    return _chain
+
+
+def _get_cache() -> DiskCache:
+    global _cache
+    with _lock:
+        if _cache is None:
+            _cache = DiskCache(
+                os.path.join(CACHE_DIR, "ai_audit.sqlite"),
+                max_entries=AI_CACHE_MAX_ENTRIES,
+            )
+    return _cache
+
+
+def audit_cache_key(audit_text: str, final_score, grade) -> str:
+    """
+    Content hash of everything that determines the completion:
+    model, temperature, prompt template and the canonical inputs.
+    `audit_text` is the encoded audit from encode_audit_for_prompt().
+    """
+    canonical = json.dumps(
+        {
+            "model": MODEL,
+            "temperature": TEMPERATURE,
+            "template": PROMPT_TEMPLATE,
+            "audit": audit_text,
+            "score": final_score,
+            "grade": grade,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
     )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
 
-    chain = prompt | llm
 
-    response = chain.invoke({
-        "audit": audit_results,
+def _prompt_inputs(audit_results, final_score, grade) -> tuple[dict, int]:
+    """
+    Prompt variables plus the estimated prompt size in tokens.
+    """
+    audit_text, audit_tokens = encode_audit_for_prompt(audit_results)
+    inputs = {
+        "audit": audit_text,
         "score": final_score,
-        "grade": grade
-    })
+        "grade": json.dumps(grade, separators=(",", ":"), ensure_ascii=False, default=str),
+    }
+    return inputs, audit_tokens + estimate_tokens(PROMPT_TEMPLATE + inputs["grade"])
+
+
+def generate_ai_audit(audit_results, final_score, grade, on_token=None):
+    """
+    Returns the AI summary. With `on_token`, the completion is streamed and
+    each text chunk is passed to on_token as it arrives (a cached summary
+    is passed in one piece).
+    """
+    inputs, prompt_tokens = _prompt_inputs(audit_results, final_score, grade)
+    key = audit_cache_key(inputs["audit"], final_score, grade)
+
+    if AI_CACHE_TTL > 0:
+        cached = _get_cache().get(key)
+        if cached is not None:
+            if on_token:
+                on_token(cached)
+            return cached
+
+    config = {"metadata": {"prompt_tokens_estimate": prompt_tokens}}
+
+    if on_token:
+        parts = []
+        for chunk in _get_chain().stream(inputs, config=config):
+            if chunk.content:
+                parts.append(chunk.content)
+                on_token(chunk.content)
+        content = "".join(parts)
+    else:
+        content = _get_chain().invoke(inputs, config=config).content
+
+    if AI_CACHE_TTL > 0 and content:
+        _get_cache().set(key, content, AI_CACHE_TTL)
+
+    return content
+
+
+# ============================================================
+# BATCH SUMMARIZATION
+# ============================================================
+
+def _prepare_batch(items: list) -> tuple[list, list]:
+    """
+    Fills cached summaries into `results` and returns the cache misses
+    as (index, inputs, prompt_tokens, key) for the LLM.
+    """
+    results = [{"ai_summary": None, "error": None} for _ in items]
+    misses = []
+
+    for i, (audit_results, final_score, grade) in enumerate(items):
+        try:
+            inputs, prompt_tokens = _prompt_inputs(audit_results, final_score, grade)
+        except Exception as e:
+            results[i]["error"] = str(e)
+            continue
+
+        key = audit_cache_key(inputs["audit"], final_score, grade)
+
+        cached = _get_cache().get(key) if AI_CACHE_TTL > 0 else None
+        if cached is not None:
+            results[i]["ai_summary"] = cached
+        else:
+            misses.append((i, inputs, prompt_tokens, key))
+
+    return results, misses
+
+
+def _batch_configs(misses: list, max_concurrency: int) -> list:
+    return [
+        {
+            "max_concurrency": max_concurrency,
+            "metadata": {"prompt_tokens_estimate": prompt_tokens},
+        }
+        for _, _, prompt_tokens, _ in misses
+    ]
+
+
+def _collect_batch(results: list, misses: list, responses: list) -> list:
+    for (i, _, _, key), response in zip(misses, responses):
+        if isinstance(response, Exception):
+            results[i]["error"] = str(response)
+            continue
+
+        results[i]["ai_summary"] = response.content
+        if AI_CACHE_TTL > 0 and response.content:
+            _get_cache().set(key, response.content, AI_CACHE_TTL)
+
+    return results
+
+
+def generate_ai_audits_batch(items: list, max_concurrency: int = AI_BATCH_CONCURRENCY) -> list[dict]:
+    """
+    Summarizes many (audit_results, final_score, grade) tuples with one
+    chain.batch call, at most `max_concurrency` requests in flight.
+    Cached summaries are not re-requested.
+
+    Returns one {"ai_summary", "error"} dict per item, in input order.
+    A failed item has ai_summary=None and the error message; it never
+    aborts the rest of the batch.
+    """
+    results, misses = _prepare_batch(items)
+    if not misses:
+        return results
+
+    responses = _get_chain().batch(
+        [inputs for _, inputs, _, _ in misses],
+        config=_batch_configs(misses, max_concurrency),
+        return_exceptions=True,
+    )
+
+    return _collect_batch(results, misses, responses)
+
+
+async def agenerate_ai_audits_batch(items: list, max_concurrency: int = AI_BATCH_CONCURRENCY) -> list[dict]:
+    """
+    Async version of generate_ai_audits_batch() using chain.abatch.
+    """
+    results, misses = _prepare_batch(items)
+    if not misses:
+        return results
+
+    responses = await _get_chain().abatch(
+        [inputs for _, inputs, _, _ in misses],
+        config=_batch_configs(misses, max_concurrency),
+        return_exceptions=True,
+    )
 
-    return response.content
+    return _collect_batch(results, misses, responses)
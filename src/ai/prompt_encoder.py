@@ -0,0 +1,164 @@
+import json
+import math
+import os
+
+# Max tokens spent on the audit data inside the prompt
+PROMPT_TOKEN_BUDGET = int(os.getenv("AI_PROMPT_TOKEN_BUDGET", "1500"))
+
+# Short, still self-explanatory keys for the LLM
+KEY_ALIASES = {
+    # sections
+    "business_info": "business",
+    "tech_stack": "tech",
+    "pagespeed": "speed",
+    "google_reviews": "google",
+    "facebook_reviews": "facebook",
+    "seo_visibility": "seo",
+
+    # business info
+    "business_name": "name",
+    "text_enabled": "sms",
+    "contact_page": "contact_pg",
+    "platform_hint": "platform",
+
+    # tech stack
+    "google_ads_pixel": "ads_pixel",
+    "chat_widget": "chat",
+
+    # pagespeed
+    "psi_mobile_score": "mobile",
+    "psi_desktop_score": "desktop",
+
+    # google business profile / reviews
+    "gbp_claimed": "claimed",
+    "gbp_rating": "rating",
+    "gbp_review_count": "review_count",
+    "gbp_hours": "hours",
+    "gbp_photos": "photos",
+    "gbp_phone": "phone",
+    "gbp_address": "address",
+    "google_reviews_total": "reviews",
+    "google_reviews_positive": "pos",
+    "google_reviews_negative": "neg",
+    "google_reply_rate": "reply_rate",
+    "google_avg_response_time": "avg_reply_hours",
+    "google_median_response_time": "median_reply_hours",
+    "google_rating_trend": "rating_trend",
+
+    # facebook
+    "facebook_reviews_total": "reviews",
+    "facebook_reviews_positive": "pos",
+    "facebook_reviews_negative": "neg",
+    "facebook_reviews_unknown": "unknown",
+    "facebook_reply_rate": "reply_rate",
+    "facebook_avg_response_time": "avg_reply_hours",
+    "facebook_median_response_time": "median_reply_hours",
+    "facebook_rating_trend": "rating_trend",
+
+    # seo
+    "keyword_rankings": "rankings",
+    "visibility_score": "visibility",
+}
+
+# Derived data / match evidence, never worth the tokens
+DROP_KEYS = {"keyword_visibility", "evidence"}
+
+# Dropped first when the budget is tight (least useful for the summary)
+LOW_PRIORITY_KEYS = {
+    "mobile_fcp", "mobile_lcp", "mobile_tbt", "mobile_cls",
+    "desktop_fcp", "desktop_lcp", "desktop_tbt", "desktop_cls",
+    "phones", "hours", "gbp_hours",
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token count (~4 characters per token for English/JSON).
+    """
+    return math.ceil(len(text) / 4)
+
+
+def _is_empty(value) -> bool:
+    return value is None or value == "" or value == [] or value == {}
+
+
+def _summarize_rankings(rankings: dict, max_keywords: int) -> dict:
+    """
+    Keeps the best-ranked and worst-ranked keywords plus counts instead of
+    the full map.
+    """
+    ranked = sorted(((q, r) for q, r in rankings.items() if r), key=lambda x: x[1])
+    unranked = [q for q, r in rankings.items() if not r]
+
+    summary = {
+        "keywords": len(rankings),
+        "ranked": len(ranked),
+    }
+
+    if max_keywords > 0:
+        top = ranked[:max_keywords]
+        bottom = ranked[max(len(top), len(ranked) - max_keywords):]
+
+        if top:
+            summary["top"] = dict(top)
+        if bottom:
+            summary["bottom"] = dict(bottom)
+        if unranked:
+            summary["not_ranked"] = unranked[:max_keywords]
+
+    return summary
+
+
+def _compact(value, max_keywords: int, drop_low_priority: bool):
+    if isinstance(value, dict):
+        out = {}
+        for k, v in value.items():
+            if k in DROP_KEYS or (drop_low_priority and k in LOW_PRIORITY_KEYS):
+                continue
+
+            if k == "keyword_rankings" and isinstance(v, dict):
+                v = _summarize_rankings(v, max_keywords)
+            else:
+                v = _compact(v, max_keywords, drop_low_priority)
+
+            if _is_empty(v):
+                continue
+            out[KEY_ALIASES.get(k, k)] = v
+        return out
+
+    if isinstance(value, (list, tuple)):
+        return [v for v in (_compact(x, max_keywords, drop_low_priority) for x in value) if not _is_empty(v)]
+
+    if isinstance(value, float):
+        return round(value, 2)
+
+    return value
+
+
+def _dump(data) -> str:
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def encode_audit_for_prompt(
+    audit_results: dict,
+    token_budget: int = PROMPT_TOKEN_BUDGET,
+    max_keywords: int = 5,
+) -> tuple[str, int]:
+    """
+    Compact JSON of the collector outputs for the LLM prompt.
+    Drops None/empty fields, shortens keys and summarizes keyword maps.
+    If the result is over `token_budget`, keyword detail and low-priority
+    fields are dropped, then the text is truncated.
+
+    Returns (text, estimated_tokens).
+    """
+    attempts = [(n, False) for n in range(max_keywords, -1, -2)] + [(0, True)]
+
+    for keywords, drop_low_priority in attempts:
+        text = _dump(_compact(audit_results, keywords, drop_low_priority))
+        tokens = estimate_tokens(text)
+        if tokens <= token_budget:
+            return text, tokens
+
+    text = text[: max(token_budget * 4 - 1, 0)] + "…"
+    return text, estimate_tokens(text)
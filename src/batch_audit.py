@@ -0,0 +1,252 @@
+from dotenv import load_dotenv
+load_dotenv()
+
+import argparse
+import contextlib
+import csv
+import json
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from urllib.parse import urlparse
+
+from main import run_marketing_audit
+
+
+# ============================================================
+# INPUT
+# ============================================================
+
+URL_COLUMNS = ["url", "website", "website_url", "domain", "site"]
+
+# URLs read ahead of the workers, per worker (bounds memory on huge inputs)
+READ_AHEAD_FACTOR = 4
+
+
+def _normalize_input_url(raw: str) -> str | None:
+    u = (raw or "").strip()
+    if not u or u.startswith("#"):
+        return None
+    if not u.startswith("http://") and not u.startswith("https://"):
+        u = "https://" + u
+    return u
+
+
+def read_urls(path: str):
+    """
+    Yields URLs from a CSV file (url/website/domain column, else the first
+    column) or from a plain newline-separated list. Reads lazily, so input
+    size does not affect memory.
+    """
+    f = sys.stdin if path == "-" else open(path, newline="", encoding="utf-8")
+
+    try:
+        first = f.readline()
+        if not first:
+            return
+
+        header = next(csv.reader([first]), [])
+        lowered = [h.strip().lstrip("\ufeff").lower() for h in header]
+        col = next((lowered.index(c) for c in URL_COLUMNS if c in lowered), None)
+
+        # a known header marks a CSV even with a single column
+        if col is not None or "," in first:
+            if col is None:
+                # no header row: the first line is already data
+                col = 0
+                url = _normalize_input_url(header[0])
+                if url:
+                    yield url
+
+            for row in csv.reader(f):
+                if len(row) > col:
+                    url = _normalize_input_url(row[col])
+                    if url:
+                        yield url
+        else:
+            for line in chain([first], f):
+                url = _normalize_input_url(line)
+                if url:
+                    yield url
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def _host(url: str) -> str:
+    return urlparse(url).netloc.replace("www.", "").lower()
+
+
+# ============================================================
+# BATCH RUNNER
+# ============================================================
+
+def _audit_without_excel(url: str) -> dict:
+    # bulk runs only write to the audit store; export Excel on demand
+    return run_marketing_audit(url, export_excel=False)
+
+
+def run_batch_audit(
+    urls,
+    output=sys.stdout,
+    concurrency: int = 8,
+    per_host: int = 1,
+    progress_every: int = 10,
+    audit_fn=_audit_without_excel,
+    log=sys.stderr,
+) -> dict:
+    """
+    Audits every URL from the `urls` iterable with bounded concurrency and
+    writes each finished result to `output` as one NDJSON line.
+    At most `concurrency` audits are in flight, and at most `per_host`
+    of them target the same host. URLs of a busy host wait in a per-host
+    queue without holding a worker, so other hosts keep every slot busy.
+
+    Returns a summary: {"total", "succeeded", "failed", "failures", "elapsed_sec", "audits_per_min"}.
+    """
+    cond = threading.Condition()
+    pending = {}       # host -> deque of URLs waiting for that host
+    active = {}        # host -> audits in flight
+    state = {"in_flight": 0, "buffered": 0}
+    read_ahead = max(concurrency * READ_AHEAD_FACTOR, 1)
+
+    stats = {"total": 0, "succeeded": 0, "failed": 0}
+    failures = []
+    started = time.time()
+
+    def report_progress():
+        elapsed = time.time() - started
+        rate = stats["total"] / elapsed * 60 if elapsed else 0.0
+        print(
+            f"[batch] {stats['total']} done · {stats['failed']} failed · "
+            f"{rate:.1f} audits/min",
+            file=log,
+            flush=True,
+        )
+
+    def audit_one(url: str, host: str):
+        try:
+            result = audit_fn(url)
+        except Exception as e:
+            result = {"status": "error", "website": url, "error": str(e)}
+
+        line = json.dumps(result, default=str, ensure_ascii=False)
+
+        with cond:
+            try:
+                output.write(line + "\n")
+                output.flush()
+
+                stats["total"] += 1
+                if result.get("status") == "success":
+                    stats["succeeded"] += 1
+                else:
+                    stats["failed"] += 1
+                    failures.append({"website": url, "error": result.get("error")})
+
+                if progress_every and stats["total"] % progress_every == 0:
+                    report_progress()
+            finally:
+                state["in_flight"] -= 1
+                active[host] -= 1
+                if not active[host]:
+                    # forget idle hosts so memory stays flat on huge inputs
+                    del active[host]
+                cond.notify()
+
+    def dispatch(pool):
+        # start every buffered URL whose host is under per_host, oldest host first
+        for host in list(pending):
+            queue = pending[host]
+            while queue and state["in_flight"] < concurrency and active.get(host, 0) < per_host:
+                url = queue.popleft()
+                state["in_flight"] += 1
+                state["buffered"] -= 1
+                active[host] = active.get(host, 0) + 1
+                pool.submit(audit_one, url, host)
+            if not queue:
+                del pending[host]
+            if state["in_flight"] >= concurrency:
+                return
+
+    urls = iter(urls)
+    exhausted = False
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        while True:
+            # back-pressure: read only a bounded window ahead of the workers
+            while not exhausted and state["buffered"] < read_ahead:
+                url = next(urls, None)
+                if url is None:
+                    exhausted = True
+                    break
+                host = _host(url)
+                with cond:
+                    pending.setdefault(host, deque()).append(url)
+                    state["buffered"] += 1
+
+            with cond:
+                dispatch(pool)
+                if exhausted and not state["buffered"]:
+                    break
+                # a busy host only blocks its own URLs: wait for any audit to finish
+                cond.wait()
+
+    elapsed = time.time() - started
+
+    return {
+        **stats,
+        "failures": failures,
+        "elapsed_sec": round(elapsed, 2),
+        "audits_per_min": round(stats["total"] / elapsed * 60, 2) if elapsed else 0.0,
+    }
+
+
+# ============================================================
+# CLI
+# ============================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Audit many websites and stream results as NDJSON."
+    )
+    parser.add_argument("input", help="CSV or newline list of URLs ('-' for stdin)")
+    parser.add_argument("-o", "--output", default="-", help="NDJSON output file ('-' for stdout)")
+    parser.add_argument("-c", "--concurrency", type=int, default=8, help="audits in flight at once")
+    parser.add_argument("--per-host", type=int, default=1, help="max concurrent audits per host")
+    parser.add_argument("--progress-every", type=int, default=10, help="print progress every N audits")
+    args = parser.parse_args(argv)
+
+    to_stdout = args.output == "-"
+    out = sys.stdout if to_stdout else open(args.output, "a", encoding="utf-8")
+
+    try:
+        # keep stray prints from collectors out of the NDJSON stream
+        with contextlib.redirect_stdout(sys.stderr if to_stdout else sys.stdout):
+            summary = run_batch_audit(
+                read_urls(args.input),
+                output=out,
+                concurrency=args.concurrency,
+                per_host=args.per_host,
+                progress_every=args.progress_every,
+            )
+    finally:
+        if not to_stdout:
+            out.close()
+
+    print(
+        f"\n[batch] finished: {summary['succeeded']} succeeded, {summary['failed']} failed "
+        f"in {summary['elapsed_sec']}s ({summary['audits_per_min']} audits/min)",
+        file=sys.stderr,
+    )
+    for f in summary["failures"]:
+        print(f"  ✗ {f['website']}: {f['error']}", file=sys.stderr)
+
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""
+extract_business_info benchmark (no network, no cache).
+
+Times the extractor on already parsed pages, next to the previous
+tag-by-tag address scan for comparison. Uses synthetic builder-style
+pages by default; pass saved HTML files or URLs to time real pages.
+
+    python bench_business_info.py                    # synthetic pages, 5 runs each
+    python bench_business_info.py page.html https://example.com -n 3
+    python bench_business_info.py --depth 400 --blocks 5000
+"""
+import argparse
+import re
+import statistics
+import time
+
+from collectors.business_info import extract_business_info
+from collectors.page_fetch import FetchedPage, fetch_page
+
+FOOTER = (
+    '<div class="footer"><div class="col"><div>1234 Main Street</div>'
+    "<div>Springfield, IL 62704</div></div>"
+    '<div class="col"><a href="tel:+15551234567">Call us</a>'
+    "<span>Mon - Fri 9am - 5pm</span></div></div>"
+)
+
+
+def deep_page(depth: int) -> str:
+    """
+    Page builders nest wrappers dozens of levels deep, each with a bit of text.
+    """
+    opening = "".join(f'<div class="wrap-{i}"><span>Section {i} copy</span>' for i in range(depth))
+    return f"<html><head><title>Deep Co</title></head><body>{opening}{FOOTER}{'</div>' * depth}</body></html>"
+
+
+def wide_page(blocks: int) -> str:
+    cards = "".join(
+        f'<div class="card"><div class="inner"><p>Item {i} ships in 2 days</p>'
+        f"<span>Only $19.99</span></div></div>"
+        for i in range(blocks)
+    )
+    return f"<html><head><title>Wide Co</title></head><body>{cards}{FOOTER}</body></html>"
+
+
+def legacy_address_scan(soup) -> list:
+    """
+    Step 6 as it was: get_text on every p/span/div (quadratic on deep DOMs).
+    """
+    candidates = []
+    for tag in soup.find_all(["p", "span", "div"]):
+        text = tag.get_text(" ", strip=True)
+        if re.search(r'\d{5}', text) and re.search(r'\d{1,5}', text):
+            if any(word in text.lower() for word in [
+                "drive", "dr", "street", "st", "road", "rd",
+                "avenue", "ave", "blvd", "lane", "ln"
+            ]):
+                candidates.append(text)
+    return candidates
+
+
+def load_page(source: str) -> FetchedPage:
+    if source.startswith(("http://", "https://")):
+        return fetch_page(source)
+    with open(source, "r", encoding="utf-8", errors="replace") as f:
+        return FetchedPage(source, html=f.read())
+
+
+def median_ms(fn, runs: int) -> float:
+    times = []
+    for _ in range(runs):
+        t = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t)
+    return round(statistics.median(times) * 1000, 1)
+
+
+def bench(label: str, page: FetchedPage, runs: int, legacy: bool = True):
+    if not page.ok:
+        print(f"{label:28} ERROR {page.error}")
+        return
+
+    soup = page.soup  # parse once; only extraction is timed
+    extract = extract_business_info.__wrapped__  # bypass the collector cache
+
+    new_ms = median_ms(lambda: extract(page.url, page=page), runs)
+    old_ms = median_ms(lambda: legacy_address_scan(soup), runs) if legacy else None
+    result = extract(page.url, page=page)
+
+    old = f"{old_ms:10.1f} ms" if old_ms is not None else "         -"
+    print(f"{label:28} {len(page.html) / 1024:8.0f} KB {new_ms:10.1f} ms {old}   "
+          f"address={result['address']!r} phones={result['phones']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("sources", nargs="*", help="HTML files or URLs (default: synthetic pages)")
+    parser.add_argument("-n", "--runs", type=int, default=5)
+    parser.add_argument("--depth", type=int, default=300, help="nesting depth of the synthetic deep page")
+    parser.add_argument("--blocks", type=int, default=3000, help="card count of the synthetic wide page")
+    parser.add_argument("--no-legacy", action="store_true", help="skip the old step-6 scan")
+    args = parser.parse_args(argv)
+
+    print(f"{'page':28} {'size':>11} {'extract':>13} {'old step 6':>13}")
+
+    if args.sources:
+        for source in args.sources:
+            bench(source[-28:], load_page(source), args.runs, not args.no_legacy)
+        return
+
+    bench(f"synthetic deep ({args.depth})", FetchedPage("deep", html=deep_page(args.depth)), args.runs, not args.no_legacy)
+    bench(f"synthetic wide ({args.blocks})", FetchedPage("wide", html=wide_page(args.blocks)), args.runs, not args.no_legacy)
+
+
+if __name__ == "__main__":
+    main()
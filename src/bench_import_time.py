@@ -0,0 +1,84 @@
+"""
+Import-time benchmark.
+
+Imports each entry point in a fresh interpreter and reports the median
+wall time plus which heavy dependencies got loaded along the way.
+
+    python bench_import_time.py            # default modules, 5 runs each
+    python bench_import_time.py main -n 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+MODULES = [
+    "main",
+    "batch_audit",
+    "collectors.business_info",
+    "collectors.tech_stack",
+    "collectors.pagespeed",
+    "collectors.gbp_reviews",
+    "collectors.facebook_reviews",
+    "collectors.review_analytics",
+    "collectors.seo_visibility",
+    "ai.langchain_audit_chain",
+    "storage.excel_store",
+]
+
+HEAVY = ["pandas", "langchain_core", "langchain_openai", "apify_client", "bs4", "openai", "numpy"]
+
+PROBE = """
+import json, sys, time
+t = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - t
+print(json.dumps({{"sec": elapsed, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(module: str, runs: int) -> dict:
+    times = []
+    heavy = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY)],
+            cwd=SRC_DIR,
+            capture_output=True,
+            text=True,
+        )
+        if out.returncode != 0:
+            err = (out.stderr.strip().splitlines() or ["?"])[-1]
+            return {"module": module, "error": err}
+        data = json.loads(out.stdout.strip().splitlines()[-1])
+        times.append(data["sec"])
+        heavy = data["heavy"]
+
+    return {
+        "module": module,
+        "median_ms": round(statistics.median(times) * 1000, 1),
+        "heavy_loaded": heavy,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    parser.add_argument("-n", "--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    for module in args.modules:
+        r = measure(module, args.runs)
+        if "error" in r:
+            print(f"{module:32} ERROR {r['error']}")
+        else:
+            heavy = ", ".join(r["heavy_loaded"]) or "-"
+            print(f"{module:32} {r['median_ms']:8.1f} ms   heavy: {heavy}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,39 @@
-import requests
 import re
-from bs4 import BeautifulSoup
+import sys
 from urllib.parse import urljoin
 
+from collectors.cache import cached_collector
+from collectors.page_fetch import FetchedPage, fetch_page
+from collectors.site_crawler import CRAWL_ENABLED, crawl_site
+
+# --------------------------------------------------
+# Patterns (compiled once)
+# --------------------------------------------------
+# US-style numbers; the digit guards stop matches inside longer numbers
+PHONE_RE = re.compile(r'(?<!\d)(\(?\d{3}\)?[\s.-]?\d{3}[\s.-]\d{4})(?!\d)')
+ZIP_RE = re.compile(r'\b\d{5}(?:-\d{4})?\b')
+STREET_RE = re.compile(
+    r'\b\d{1,6}\s+(?:[\w.\'-]+\s+){0,5}?'
+    r'(?:drive|dr|street|st|road|rd|avenue|ave|boulevard|blvd|lane|ln|'
+    r'way|court|ct|highway|hwy|parkway|pkwy|suite|ste)\b',
+    re.IGNORECASE,
+)
+HOURS_RE = re.compile(
+    r'\b(?:mon(?:day)?|tue(?:s|sday)?|wed(?:nesday)?|thu(?:r|rs|rsday)?|'
+    r'fri(?:day)?|sat(?:urday)?|sun(?:day)?)\b'
+)
+
+# Text is grouped by its nearest enclosing block element
+BLOCK_TAGS = {
+    "p", "div", "li", "address", "td", "th", "dd", "dt", "section",
+    "article", "footer", "header", "aside", "main", "nav", "form",
+    "h1", "h2", "h3", "h4", "h5", "h6",
+}
+MAX_ADDRESS_LEN = 300
+
+TEXT_KEYWORDS = ["text us", "sms", "text message", "texting"]
+PLATFORM_HINTS = ["wordpress", "shopify", "wix", "squarespace", "freerentalsite"]
+
 
 def clean_address(raw_address: str) -> str:
     """
@@ -30,11 +61,86 @@ def clean_address(raw_address: str) -> str:
     return cleaned.title()
 
 
-def extract_business_info(url: str) -> dict:
+def _block_ancestor(node, memo: dict):
+    parent = node.parent
+    key = id(parent)
+    if key not in memo:
+        block = parent
+        while block is not None and block.name not in BLOCK_TAGS:
+            block = block.parent
+        memo[key] = block
+    return memo[key]
+
+
+def _scan_blocks(soup) -> tuple[list[str], str]:
     """
-    Extracts basic business information from a website.
+    Single pass over the visible text nodes (scripts/styles excluded).
+    Returns the text of each block element in document order and the
+    whole visible text.
+    """
+    blocks = {}
+    parts = []
+    memo = {}
+
+    for node in soup.strings:
+        text = node.strip()
+        if not text:
+            continue
+        parts.append(text)
+        blocks.setdefault(id(_block_ancestor(node, memo)), []).append(text)
+
+    return [" ".join(b) for b in blocks.values()], " ".join(parts)
+
+
+def _find_address(block_texts: list[str]) -> str | None:
     """
+    A block with a street number + street word and a ZIP code. Street and
+    ZIP are often split over two sibling blocks, so a ZIP-only block is
+    also tried joined to the one before it when that one has a street but
+    no ZIP of its own.
+    """
+    candidates = []
+    prev = ""
+
+    for text in block_texts:
+        if ZIP_RE.search(text):
+            if STREET_RE.search(text):
+                candidates.append(text)
+            elif prev and STREET_RE.search(prev) and not ZIP_RE.search(prev):
+                candidates.append(prev + " " + text)
+        prev = text
+
+    candidates = [c for c in candidates if len(c) <= MAX_ADDRESS_LEN]
+    if not candidates:
+        return None
+
+    # Pick the longest one (usually most complete)
+    return max(candidates, key=len)
+
 
+def _collect_phones(visible_text: str, tel_links: list[str]) -> list[str]:
+    """
+    Phones from visible text plus tel: links, de-duplicated by digits.
+    """
+    phones = {}
+
+    for phone in PHONE_RE.findall(visible_text):
+        phones.setdefault(re.sub(r"\D", "", phone), phone)
+
+    for href in tel_links:
+        digits = re.sub(r"\D", "", href)
+        if len(digits) == 11 and digits.startswith("1"):
+            digits = digits[1:]
+        if len(digits) == 10:
+            phones.setdefault(digits, f"({digits[:3]}) {digits[3:6]}-{digits[6:]}")
+
+    return list(phones.values())
+
+
+def _extract_fields(page: FetchedPage) -> dict:
+    """
+    Steps 2-8 on one fetched page.
+    """
     result = {
         "business_name": None,
         "phones": [],
@@ -45,17 +151,7 @@ def extract_business_info(url: str) -> dict:
         "platform_hint": None,
     }
 
-
-    # 1. Fetch website HTML
-    try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-    except Exception as e:
-        print("Error fetching website:", e)
-        return result
-
-    html = response.text
-    soup = BeautifulSoup(html, "html.parser")
+    soup = page.soup
 
     # 2. Business name (title or h1)
     if soup.title and soup.title.text:
@@ -65,55 +161,103 @@ def extract_business_info(url: str) -> dict:
     if h1 and h1.text:
         result["business_name"] = h1.text.strip()
 
-    # 3. Phone numbers (US-style)
-    phone_pattern = re.compile(r'(\(?\d{3}\)?[\s.-]\d{3}[\s.-]\d{4})')
-    phones = phone_pattern.findall(html)
-    result["phones"] = list(set(phones))
+    # One pass over the text nodes feeds steps 3, 5, 6, 7 and 8
+    block_texts, visible_text = _scan_blocks(soup)
+    page_text = visible_text.lower()
 
-    # 4. Contact page detection
+    # 4. Contact page detection (+ tel: links for step 3)
+    tel_links = []
     for link in soup.find_all("a", href=True):
-        if "contact" in link["href"].lower():
+        href = link["href"].lower()
+        if href.startswith("tel:"):
+            tel_links.append(href)
+        if "contact" in href:
             result["contact_page"] = True
-            break
+
+    # 3. Phone numbers (US-style, visible text + tel: links)
+    result["phones"] = _collect_phones(visible_text, tel_links)
 
     # 5. Text-enabled number detection (heuristic)
-    text_keywords = ["text us", "sms", "text message", "texting"]
-    page_text = soup.get_text(separator=" ").lower()
-    for keyword in text_keywords:
-        if keyword in page_text:
-            result["text_enabled"] = True
-            break
+    result["text_enabled"] = any(k in page_text for k in TEXT_KEYWORDS)
 
     # 6. Address detection (best-effort, safe)
-    address_candidates = []
-
-    for tag in soup.find_all(["p", "span", "div"]):
-        text = tag.get_text(" ", strip=True)
-        if re.search(r'\d{5}', text) and re.search(r'\d{1,5}', text):
-            if any(word in text.lower() for word in [
-                "drive", "dr", "street", "st", "road", "rd",
-                "avenue", "ave", "blvd", "lane", "ln"
-            ]):
-                address_candidates.append(text)
-
-    if address_candidates:
-        # Pick the longest one (usually most complete)
-        result["address"] = max(address_candidates, key=len)
-
-
+    result["address"] = _find_address(block_texts)
 
     # 7. Hours detection
-    hours_keywords = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
-    if any(day in page_text for day in hours_keywords):
+    if HOURS_RE.search(page_text):
         result["hours"] = "Hours information found on page"
 
     # 8. Platform hint detection
-    platform_hints = ["wordpress", "shopify", "wix", "squarespace", "freerentalsite"]
-    for platform in platform_hints:
+    for platform in PLATFORM_HINTS:
         if platform in page_text:
             result["platform_hint"] = platform.capitalize()
             break
 
+    return result
+
+
+def _merge_crawled(result: dict, pages: list[FetchedPage]):
+    """
+    Fills gaps in the homepage result from crawled pages (best page first).
+    """
+    digits = {re.sub(r"\D", "", p) for p in result["phones"]}
+
+    for page in pages:
+        fields = _extract_fields(page)
+        result["pages_crawled"].append(page.final_url)
+
+        for phone in fields["phones"]:
+            key = re.sub(r"\D", "", phone)
+            if key not in digits:
+                digits.add(key)
+                result["phones"].append(phone)
+
+        for key in ("address", "hours", "platform_hint"):
+            if not result[key]:
+                result[key] = fields[key]
+
+        result["text_enabled"] = result["text_enabled"] or fields["text_enabled"]
+        result["contact_page"] = result["contact_page"] or fields["contact_page"]
+
+
+@cached_collector("business_info", skip_if=lambda r: not r.get("business_name"))
+def extract_business_info(url: str, page: FetchedPage | None = None, crawl: bool = CRAWL_ENABLED) -> dict:
+    """
+    Extracts basic business information from a website.
+    Pass an already fetched `page` to avoid downloading the homepage again.
+    With `crawl` (default: BUSINESS_INFO_CRAWL env) missing details are filled
+    from a few contact/location/about pages fetched in parallel.
+    """
+
+    result = {
+        "business_name": None,
+        "phones": [],
+        "address": None,
+        "hours": None,
+        "text_enabled": False,
+        "contact_page": False,
+        "platform_hint": None,
+        "page_truncated": False,
+        "pages_crawled": [],
+    }
+
+
+    # 1. Fetch website HTML (or reuse the shared page)
+    if page is None:
+        page = fetch_page(url, timeout=10)
+
+    if not page.ok:
+        print("Error fetching website:", page.error, file=sys.stderr)
+        return result
+
+    result["page_truncated"] = page.truncated
+
+    result.update(_extract_fields(page))
+
+    # 9. Optional bounded crawl of contact/location/about pages
+    if crawl:
+        _merge_crawled(result, crawl_site(page))
+
     # Clean address if found
     if result["address"]:
         result["address"] = clean_address(result["address"])
@@ -0,0 +1,156 @@
+# collectors/cache.py
+import functools
+import hashlib
+import inspect
+import json
+import os
+import threading
+
+from utils.disk_cache import CACHE_DIR, DiskCache
+from utils.urls import normalize_url
+
+DAY = 24 * 60 * 60
+
+# Default freshness per collector (seconds). Override with CACHE_TTL_<NAME>.
+COLLECTOR_TTLS = {
+    "business_info": 1 * DAY,
+    "tech_stack": 1 * DAY,
+    "social_links": 1 * DAY,
+    "pagespeed": 1 * DAY,
+    "gbp_reviews": 7 * DAY,
+    "facebook_reviews": 7 * DAY,
+    "seo_visibility": 3 * DAY,
+}
+
+CACHE_ENABLED = os.getenv("COLLECTOR_CACHE_ENABLED", "1") not in ("0", "false", "False")
+CACHE_MAX_ENTRIES = int(os.getenv("COLLECTOR_CACHE_MAX_ENTRIES", "20000"))
+
+# arguments that are never part of the key (already-fetched page objects etc.)
+_IGNORED_ARGS = {"page"}
+_URL_ARGS = {"url", "website_url", "target_website", "facebook_page_url"}
+
+_backend = None
+_backend_lock = threading.Lock()
+_counters = {}
+_counters_lock = threading.Lock()
+
+
+# --------------------------------------------------
+# BACKEND
+# --------------------------------------------------
+def get_collector_cache():
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = DiskCache(
+                os.path.join(CACHE_DIR, "collectors.sqlite"),
+                max_entries=CACHE_MAX_ENTRIES,
+            )
+    return _backend
+
+
+def set_collector_cache(backend):
+    """
+    Swaps the storage backend (anything with get/set/delete/clear/stats).
+    """
+    global _backend
+    with _backend_lock:
+        _backend = backend
+
+
+def collector_ttl(name: str) -> int:
+    return int(os.getenv(f"CACHE_TTL_{name.upper()}", COLLECTOR_TTLS.get(name, DAY)))
+
+
+# --------------------------------------------------
+# KEYS
+# --------------------------------------------------
+def _normalize_value(name: str, value):
+    if isinstance(value, str):
+        return normalize_url(value) if name in _URL_ARGS else value.strip()
+    return value
+
+
+def _cache_key(name: str, signature: inspect.Signature, args, kwargs) -> str:
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+
+    inputs = {
+        k: _normalize_value(k, v)
+        for k, v in bound.arguments.items()
+        if k not in _IGNORED_ARGS
+    }
+
+    digest = hashlib.sha256(
+        json.dumps(inputs, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+    return f"{name}:{digest}"
+
+
+def _count(name: str, field: str):
+    with _counters_lock:
+        c = _counters.setdefault(name, {"hits": 0, "misses": 0})
+        c[field] += 1
+
+
+# --------------------------------------------------
+# DECORATOR
+# --------------------------------------------------
+def cached_collector(name: str, skip_if=None):
+    """
+    Caches a collector's result keyed by `name` + its normalized inputs.
+    `skip_if(result)` returning True keeps empty/failed results out of the
+    cache so they are retried on the next audit.
+    Call the collector with refresh=True to skip the lookup and overwrite
+    the stored entry.
+    """
+
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args, refresh: bool = False, **kwargs):
+            if not CACHE_ENABLED:
+                return fn(*args, **kwargs)
+
+            cache = get_collector_cache()
+            key = _cache_key(name, signature, args, kwargs)
+
+            cached = None if refresh else cache.get(key)
+            if cached is not None:
+                _count(name, "hits")
+                return cached["result"]
+
+            _count(name, "misses")
+            result = fn(*args, **kwargs)
+
+            if skip_if is None or not skip_if(result):
+                cache.set(key, {"result": result}, collector_ttl(name))
+
+            return result
+
+        def invalidate(*args, **kwargs):
+            get_collector_cache().delete(_cache_key(name, signature, args, kwargs))
+
+        wrapper.invalidate = invalidate
+        wrapper.cache_name = name
+        return wrapper
+
+    return decorator
+
+
+def clear_collector_cache(name: str | None = None):
+    """
+    Drops cached results for one collector, or for all of them.
+    """
+    get_collector_cache().clear(f"{name}:" if name else "")
+
+
+def collector_cache_stats() -> dict:
+    with _counters_lock:
+        per_collector = {k: dict(v) for k, v in _counters.items()}
+    return {
+        "collectors": per_collector,
+        "backend": get_collector_cache().stats(),
+    }
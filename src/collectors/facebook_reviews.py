@@ -1,125 +1,70 @@
 import os
-from dotenv import load_dotenv
-from apify_client import ApifyClient
 
-load_dotenv()
+from collectors.cache import cached_collector
+from collectors.review_analytics import ReviewColumns, analyze_reviews, empty_review_stats, source_fields
+from utils.apify import get_apify_client
 
-APIFY_API_TOKEN = os.getenv("APIFY_API_TOKEN")
+# Popular and stable Facebook reviews actor
+ACTOR_ID = "apify/facebook-reviews-scraper"
 
+# Reviews analyzed per page (also the actor's maxReviews)
+FACEBOOK_REVIEW_SAMPLE = int(os.getenv("FACEBOOK_REVIEW_SAMPLE", "200"))
 
-def analyze_facebook_reviews(reviews: list) -> dict:
+
+class FacebookReviewAccumulator:
     """
-    Analyzes Facebook reviews / recommendations robustly.
-    Handles different actor field formats.
+    Feed reviews one at a time with add(), read the collector output with
+    result(). Only the analyzed fields are buffered (as columns), so memory
+    is bounded by the sample size, not by the actor's item size.
     """
-    if not reviews:
-        return {
-            "facebook_reviews_total": None,
-            "facebook_reviews_positive": None,
-            "facebook_reviews_negative": None,
-            "facebook_reviews_unknown": None,
-            "facebook_reply_rate": None,
-            "facebook_avg_response_time": None,
-        }
-
-    total = len(reviews)
-    positive = 0
-    negative = 0
-    unknown = 0
-    replied = 0
-
-    def to_bool_like(x):
-        """Convert various yes/no/true/false formats to boolean-like or None."""
-        if x is None:
-            return None
-        if isinstance(x, bool):
-            return x
-        s = str(x).strip().lower()
-        if s in ["true", "yes", "y", "recommended", "positive", "recommend"]:
-            return True
-        if s in ["false", "no", "n", "not recommended", "not_recommended", "negative", "notrecommend"]:
-            return False
-        return None
-
-    for r in reviews:
-        # Possible fields from different scrapers
-        rec_raw = (
-            r.get("recommended")
-            or r.get("is_recommended")
-            or r.get("isRecommended")
-            or r.get("recommendation")
-            or r.get("recommendationType")
-        )
-
-        rec = to_bool_like(rec_raw)
-
-        if rec is True:
-            positive += 1
-        elif rec is False:
-            negative += 1
-        else:
-            # Try rating/stars fallback if present
-            rating = r.get("rating") or r.get("stars")
-            if rating is not None:
-                try:
-                    rating = float(rating)
-                    if rating >= 4:
-                        positive += 1
-                    elif rating <= 2:
-                        negative += 1
-                    else:
-                        unknown += 1
-                except Exception:
-                    unknown += 1
-            else:
-                unknown += 1
-
-        # Owner reply detection (varies by output)
-        if r.get("response") or r.get("ownerResponse") or r.get("reply"):
-            replied += 1
-
-    reply_rate = round((replied / total) * 100, 2) if total else None
-
-    return {
-        "facebook_reviews_total": total,
-        "facebook_reviews_positive": positive,
-        "facebook_reviews_negative": negative,
-        "facebook_reviews_unknown": unknown,
-        "facebook_reply_rate": reply_rate,
-        "facebook_avg_response_time": None,
-    }
 
+    def __init__(self):
+        self.columns = ReviewColumns("facebook")
+
+    @property
+    def total(self) -> int:
+        return len(self.columns)
 
+    def add(self, r: dict):
+        self.columns.append(r)
 
-def fetch_facebook_reviews(facebook_page_url: str | None) -> dict:
+    def result(self) -> dict:
+        return analyze_reviews(self.columns, "facebook")
+
+
+def analyze_facebook_reviews(reviews) -> dict:
     """
-    Fetches Facebook reviews using Apify.
+    Analyzes Facebook reviews / recommendations robustly.
+    Handles different actor field formats (see review_analytics).
     """
-    if not facebook_page_url:
-        return {
-            "facebook_reviews_total": None,
-            "facebook_reviews_positive": None,
-            "facebook_reviews_negative": None,
-            "facebook_reply_rate": None,
-            "facebook_avg_response_time": None,
-        }
+    return analyze_reviews(list(reviews or ()), "facebook")
 
-    if not APIFY_API_TOKEN:
-        raise RuntimeError("APIFY_API_TOKEN missing")
 
-    client = ApifyClient(APIFY_API_TOKEN)
+@cached_collector("facebook_reviews", skip_if=lambda r: not r.get("facebook_reviews_total"))
+def fetch_facebook_reviews(facebook_page_url: str | None, sample_size: int = FACEBOOK_REVIEW_SAMPLE) -> dict:
+    """
+    Fetches Facebook reviews using Apify.
+    Reviews are streamed from the dataset (needed fields only) into the
+    accumulator and reading stops after `sample_size` reviews.
+    """
+    if not facebook_page_url:
+        return empty_review_stats("facebook")
 
-    # Popular and stable Facebook reviews actor
-    ACTOR_ID = "apify/facebook-reviews-scraper"
+    client = get_apify_client()
 
     run_input = {
         "startUrls": [{"url": facebook_page_url}],
-        "maxReviews": 200,
+        "maxReviews": sample_size,
         "language": "en",
     }
 
     run = client.actor(ACTOR_ID).call(run_input=run_input)
     dataset_id = run["defaultDatasetId"]
-    items = list(client.dataset(dataset_id).iterate_items())
 
-    return analyze_facebook_reviews(items)
+    acc = FacebookReviewAccumulator()
+    for item in client.dataset(dataset_id).iterate_items(fields=source_fields("facebook"), limit=sample_size):
+        acc.add(item)
+        if acc.total >= sample_size:
+            break
+
+    return acc.result()
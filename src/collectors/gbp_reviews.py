@@ -1,12 +1,11 @@
 # collectors/gbp_reviews.py
 import os
 from urllib.parse import urlparse
-from difflib import SequenceMatcher
-from dotenv import load_dotenv
-from apify_client import ApifyClient
 
-load_dotenv()
-APIFY_API_TOKEN = os.getenv("APIFY_API_TOKEN")
+from collectors.cache import cached_collector
+from collectors.review_analytics import analyze_reviews, analyze_reviews_batch
+from utils.apify import get_apify_client
+from utils.entity_match import EntityIndex, name_signature, name_similarity
 
 def _safe_float(x):
     try:
@@ -23,110 +22,217 @@ def _safe_int(x):
 def _norm_domain(url: str) -> str:
     if not url:
         return ""
-    return urlparse(url).netloc.replace("www.", "").lower()
+    if "://" not in url:
+        url = "https://" + url
+    host = (urlparse(url).hostname or "").lower().rstrip(".")
+    return host[4:] if host.startswith("www.") else host
 
-def _name_sim(a: str, b: str) -> float:
-    a = (a or "").lower().strip()
-    b = (b or "").lower().strip()
+def _same_site(a: str, b: str) -> bool:
+    """
+    True for equal domains or a subdomain of the other
+    (shop.acme.com ~ acme.com, but not acmeplumbing.net ~ acme.com).
+    """
     if not a or not b:
-        return 0.0
-    return SequenceMatcher(None, a, b).ratio()
+        return False
+    return a == b or a.endswith("." + b) or b.endswith("." + a)
+
+def _name_sim(a: str, b: str) -> float:
+    return name_similarity(a, b)
 
 def analyze_google_reviews(reviews: list) -> dict:
-    if not reviews:
-        return {
-            "google_reviews_total": None,
-            "google_reviews_positive": None,
-            "google_reviews_negative": None,
-            "google_reply_rate": None,
-            "google_avg_response_time": None,
-        }
-
-    total = len(reviews)
-    pos = 0
-    neg = 0
-    replied = 0
-
-    for r in reviews:
-        rating = r.get("rating") or r.get("stars") or r.get("reviewRating")
-        rating = _safe_float(rating)
-        if rating is not None:
-            if rating >= 4: pos += 1
-            if rating <= 2: neg += 1
-
-        owner_resp = r.get("ownerResponse") or r.get("response") or r.get("reviewReply")
-        if owner_resp:
-            replied += 1
-
-    reply_rate = round((replied / total) * 100, 2) if total else None
+    return analyze_reviews(reviews, "google")
+
+ACTOR_ID = "compass/crawler-google-places"
+
+# Reviews fetched for the matched place
+GBP_MAX_REVIEWS = int(os.getenv("GBP_MAX_REVIEWS", "200"))
+
+# Search places without reviews first, then fetch reviews for the winner only.
+# Set to 0 to fetch reviews for every candidate in one run (old behaviour).
+GBP_TWO_PHASE = os.getenv("GBP_TWO_PHASE", "1") not in ("0", "false", "False")
 
+# Name score needed to attribute an untagged place to a business in a batch
+UNTAGGED_MIN_SCORE = 0.5
+
+
+def _empty_gbp_result() -> dict:
     return {
-        "google_reviews_total": total,
-        "google_reviews_positive": pos,
-        "google_reviews_negative": neg,
-        "google_reply_rate": reply_rate,
-        "google_avg_response_time": None,
+        "gbp_claimed": None,
+        "gbp_rating": None,
+        "gbp_review_count": None,
+        "gbp_hours": None,
+        "gbp_photos": None,
+        "gbp_phone": None,
+        "gbp_address": None,
+        **analyze_google_reviews([]),
     }
 
-def fetch_gbp_and_google_reviews(search_term: str, location: str = "", target_website: str | None = None) -> dict:
-    if not APIFY_API_TOKEN:
-        raise RuntimeError("APIFY_API_TOKEN missing in .env")
+def _build_query(search_term: str, location: str = "") -> str:
+    return f"{search_term} {location}".strip()
+
+def _run_places(client, queries: list[str], max_reviews: int = 0) -> list:
+    run_input = {
+        "searchStringsArray": queries,
+        "maxCrawledPlacesPerSearch": 5,   # 👈 IMPORTANT
+        "maxReviews": max_reviews,
+        "language": "en",
+    }
+
+    run = client.actor(ACTOR_ID).call(run_input=run_input)
+    dataset_id = run["defaultDatasetId"]
+    return list(client.dataset(dataset_id).iterate_items())
 
-    client = ApifyClient(APIFY_API_TOKEN)
+def _place_key(place: dict) -> str:
+    return place.get("placeId") or place.get("url") or ""
 
-    ACTOR_ID = "compass/crawler-google-places"
+def _needs_reviews(place: dict) -> bool:
+    count = place.get("reviewsCount", place.get("numberOfReviews"))
+    return bool(_place_key(place)) and _safe_int(count) != 0
 
-    query = f"{search_term} {location}".strip()
+def _run_place_reviews(client, places: list[dict], max_reviews: int = GBP_MAX_REVIEWS) -> dict:
+    """
+    Phase 2: reviews for already chosen places only, in one actor run.
+    Returns {place key: reviews}.
+    """
+    place_ids = list(dict.fromkeys(p["placeId"] for p in places if p.get("placeId")))
+    urls = list(dict.fromkeys(p["url"] for p in places if not p.get("placeId") and p.get("url")))
+
+    if not place_ids and not urls:
+        return {}
 
     run_input = {
-        "searchStringsArray": [query],
-        "maxCrawledPlacesPerSearch": 5,   # 👈 IMPORTANT
-        "maxReviews": 200,
+        "maxReviews": max_reviews,
         "language": "en",
     }
+    if place_ids:
+        run_input["placeIds"] = place_ids
+    if urls:
+        run_input["startUrls"] = [{"url": u} for u in urls]
 
     run = client.actor(ACTOR_ID).call(run_input=run_input)
     dataset_id = run["defaultDatasetId"]
-    items = list(client.dataset(dataset_id).iterate_items())
-
-    if not items:
-        return {
-            "gbp_claimed": None,
-            "gbp_rating": None,
-            "gbp_review_count": None,
-            "gbp_hours": None,
-            "gbp_photos": None,
-            "gbp_phone": None,
-            "gbp_address": None,
-            **analyze_google_reviews([]),
-        }
+
+    reviews = {}
+    for item in client.dataset(dataset_id).iterate_items(fields=["placeId", "url", "reviews"]):
+        found = item.get("reviews") or []
+        for key in (item.get("placeId"), item.get("url")):
+            if key:
+                reviews[key] = found
+    return reviews
+
+def _search_and_pick(client, jobs: list[dict], queries: list[str]) -> list[dict | None]:
+    """
+    Phase 1 for many jobs: one place search, best place per job
+    (places are tagged with the `searchString` that produced them).
+    """
+    unique = [q for q in dict.fromkeys(queries) if q]
+    if not unique:
+        return [None for _ in jobs]
+
+    max_reviews = 0 if GBP_TWO_PHASE else GBP_MAX_REVIEWS
+    items = _run_places(client, unique, max_reviews)
+
+    # one name index over every returned place: signatures are built once
+    index = EntityIndex([_place_name(p) for p in items])
+
+    by_query = {}
+    for i, place in enumerate(items):
+        by_query.setdefault(place.get("searchString") or "", []).append(i)
+
+    # one query: every item belongs to it even if the tag is missing
+    if len(unique) == 1:
+        by_query = {unique[0]: list(range(len(items)))}
+
+    untagged = set(by_query.get("", ()))
+
+    picked = []
+    for job, query in zip(jobs, queries):
+        term = job.get("search_term", "")
+        ids = by_query.get(query)
+
+        if not ids and query and untagged:
+            # places without a searchString: look the business up by name
+            hits = index.search(term, top_k=len(items), min_score=UNTAGGED_MIN_SCORE)
+            ids = [i for i, _ in hits if i in untagged][:5]
+
+        picked.append(_pick_best_place(items, term, job.get("target_website"), index, ids) if ids else None)
+    return picked
+
+def _resolve(client, jobs: list[dict]) -> list[dict]:
+    queries = [_build_query(j.get("search_term", ""), j.get("location", "")) for j in jobs]
+    places = _search_and_pick(client, jobs, queries)
+
+    reviews = {}
+    if GBP_TWO_PHASE:
+        winners = [p for p in places if p is not None and _needs_reviews(p)]
+        if winners:
+            reviews = _run_place_reviews(client, winners)
+
+    # review stats for every business in one grouped pass
+    review_lists = {
+        i: reviews.get(_place_key(place), []) if GBP_TWO_PHASE else _embedded_reviews(place)
+        for i, place in enumerate(places)
+        if place is not None
+    }
+    stats = analyze_reviews_batch(review_lists, "google")
+
+    return [
+        _place_to_result(place, stats[i]) if place is not None else _empty_gbp_result()
+        for i, place in enumerate(places)
+    ]
+
+def _place_name(place: dict) -> str:
+    return place.get("title") or place.get("name") or ""
+
+def _pick_best_place(
+    items: list,
+    search_term: str,
+    target_website: str | None = None,
+    index: EntityIndex | None = None,
+    ids: list[int] | None = None,
+) -> dict:
+    """
+    Best of `items` (or of `items[i] for i in ids`) for a business:
+    website domain match first, then name similarity. Pass a prebuilt
+    `index` over `items` to reuse its name signatures.
+    """
+    if index is None:
+        index = EntityIndex([_place_name(p) for p in items])
+    if ids is None:
+        ids = range(len(items))
 
     target_domain = _norm_domain(target_website or "")
+    query = name_signature(search_term)
 
     # ✅ choose best place
     best = None
     best_score = -1
 
-    for place in items:
-        place_name = place.get("title") or place.get("name") or ""
+    for i in ids:
+        place = items[i]
         place_website = place.get("website") or place.get("url") or ""
         place_domain = _norm_domain(place_website)
 
         score = 0
 
         # strongest signal: website domain match
-        if target_domain and target_domain and (target_domain in place_domain or place_domain in target_domain):
+        if _same_site(target_domain, place_domain):
             score += 100
 
         # fallback: name similarity
-        score += int(_name_sim(search_term, place_name) * 50)
+        score += int(index.similarity(query, i) * 50)
 
         if score > best_score:
             best_score = score
             best = place
 
-    place = best or items[0]
+    return best or items[0]
 
+def _embedded_reviews(place: dict) -> list:
+    reviews = place.get("reviews") or place.get("reviewsData") or place.get("latestReviews") or []
+    return reviews if isinstance(reviews, list) else []
+
+def _place_to_result(place: dict, review_stats: dict | None = None) -> dict:
     gbp_rating = place.get("rating") or place.get("totalScore") or place.get("stars")
     gbp_review_count = place.get("reviewsCount") or place.get("numberOfReviews") or place.get("reviews")
     gbp_phone = place.get("phone") or place.get("phoneNumber") or place.get("internationalPhoneNumber")
@@ -135,8 +241,8 @@ def fetch_gbp_and_google_reviews(search_term: str, location: str = "", target_we
     gbp_photos = place.get("photosCount") or place.get("totalPhotos")
     gbp_claimed = place.get("claimed") or place.get("isClaimed") or None
 
-    reviews = place.get("reviews") or place.get("reviewsData") or place.get("latestReviews") or []
-    review_stats = analyze_google_reviews(reviews if isinstance(reviews, list) else [])
+    if review_stats is None:
+        review_stats = analyze_google_reviews(_embedded_reviews(place))
 
     return {
         "gbp_claimed": gbp_claimed,
@@ -148,3 +254,33 @@ def fetch_gbp_and_google_reviews(search_term: str, location: str = "", target_we
         "gbp_address": gbp_address,
         **review_stats,
     }
+
+@cached_collector(
+    "gbp_reviews",
+    skip_if=lambda r: r["gbp_rating"] is None and r["google_reviews_total"] is None,
+)
+def fetch_gbp_and_google_reviews(search_term: str, location: str = "", target_website: str | None = None) -> dict:
+    """
+    GBP profile + Google review stats for the best-matching place.
+    Two phases by default: a place search without reviews, scored by
+    website domain and name, then reviews for the chosen place only.
+    """
+    client = get_apify_client()
+    job = {"search_term": search_term, "location": location, "target_website": target_website}
+    return _resolve(client, [job])[0]
+
+def fetch_gbp_batch(jobs: list[dict]) -> list[dict]:
+    """
+    GBP + Google reviews for many businesses in two actor runs in total.
+
+    Each job is a dict with `search_term` and optional `location` and
+    `target_website`. Every returned place is tagged by the actor with the
+    `searchString` that produced it, so the best-place scoring runs per
+    business on its own candidates; reviews are then fetched for the
+    winners only. Results are returned in job order.
+    """
+    queries = [_build_query(j.get("search_term", ""), j.get("location", "")) for j in jobs]
+    if not any(queries):
+        return [_empty_gbp_result() for _ in jobs]
+
+    return _resolve(get_apify_client(), jobs)
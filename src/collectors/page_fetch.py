@@ -0,0 +1,199 @@
+# collectors/page_fetch.py
+import os
+import threading
+import time
+
+from utils.http_client import http_get
+
+# Pages are cut off after this many bytes / seconds of reading
+PAGE_MAX_BYTES = int(os.getenv("PAGE_MAX_BYTES", str(3 * 1024 * 1024)))
+PAGE_READ_DEADLINE = float(os.getenv("PAGE_READ_DEADLINE", "25"))
+
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+CHUNK_SIZE = 16 * 1024
+
+
+class FetchedPage:
+    """
+    A homepage fetched once per audit and shared by every HTML collector.
+    The parsed tree and visible text are built on first use only.
+    `truncated` is True when the download hit the size or time cap.
+    """
+
+    def __init__(self, url: str, final_url: str = None, headers: dict = None,
+                 html: str = "", error: str = None, truncated: bool = False):
+        self.url = url
+        self.final_url = final_url or url
+        self.headers = headers or {}
+        self.html = html or ""
+        self.error = error
+        self.truncated = truncated
+
+        self._html_lower = None
+        self._soup = None
+        self._text = None
+        # collectors share the page from parallel pipeline stages
+        self._lock = threading.Lock()
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def html_lower(self) -> str:
+        with self._lock:
+            if self._html_lower is None:
+                self._html_lower = self.html.lower()
+        return self._html_lower
+
+    @property
+    def soup(self):
+        with self._lock:
+            if self._soup is None:
+                from bs4 import BeautifulSoup
+                self._soup = BeautifulSoup(self.html, "html.parser")
+        return self._soup
+
+    @property
+    def text(self) -> str:
+        soup = self.soup
+        with self._lock:
+            if self._text is None:
+                self._text = soup.get_text(separator=" ")
+        return self._text
+
+
+def _read_capped(response, max_bytes: int, deadline_at: float) -> tuple[bytes, bool]:
+    """
+    Reads the body until EOF, the byte budget or the deadline.
+    Returns (body, truncated). Reads return whatever has arrived (read1)
+    instead of waiting for a full chunk, and a timer closes the response
+    at the deadline, so a server trickling bytes can't hold the read
+    open past it. Bytes read before the cut are kept.
+    """
+    raw = response.raw
+    read1 = getattr(raw, "read1", None)  # urllib3 >= 2
+    if read1 is not None:
+        read = lambda: read1(CHUNK_SIZE, decode_content=True)
+    else:
+        read = lambda: raw.read(CHUNK_SIZE, decode_content=True)
+
+    chunks = []
+    size = 0
+
+    watchdog = threading.Timer(max(deadline_at - time.monotonic(), 0), response.close)
+    watchdog.daemon = True
+    watchdog.start()
+
+    try:
+        while True:
+            try:
+                chunk = read()
+            except Exception:
+                if time.monotonic() >= deadline_at:
+                    # closed by the watchdog mid-read
+                    return b"".join(chunks), True
+                raise
+
+            if not chunk:
+                if time.monotonic() >= deadline_at:
+                    return b"".join(chunks), True
+                return b"".join(chunks), False
+
+            if size + len(chunk) > max_bytes:
+                chunks.append(chunk[:max_bytes - size])
+                return b"".join(chunks), True
+
+            chunks.append(chunk)
+            size += len(chunk)
+
+            if time.monotonic() >= deadline_at:
+                return b"".join(chunks), True
+    finally:
+        watchdog.cancel()
+
+
+def _decode(body: bytes, encoding: str | None) -> str:
+    try:
+        return body.decode(encoding or "utf-8", errors="replace")
+    except LookupError:
+        return body.decode("utf-8", errors="replace")
+
+
+def fetch_page(
+    url: str,
+    timeout: int = 20,
+    max_bytes: int = PAGE_MAX_BYTES,
+    deadline: float = PAGE_READ_DEADLINE,
+    content_types: tuple = HTML_CONTENT_TYPES,
+) -> FetchedPage:
+    """
+    Downloads a page once over the shared keep-alive session (with retries).
+    The body is streamed and capped at `max_bytes` and `deadline` seconds;
+    a cut-off page is kept with `truncated=True`. Responses outside
+    `content_types` (HTML by default) are rejected.
+    Never raises: failures are reported on `page.error`.
+    """
+    deadline_at = time.monotonic() + deadline
+
+    try:
+        r = http_get(url, timeout=timeout, stream=True)
+    except Exception as e:
+        return FetchedPage(url, error=str(e))
+
+    with r:
+        headers = dict(r.headers)
+
+        try:
+            r.raise_for_status()
+        except Exception as e:
+            return FetchedPage(url, final_url=r.url, headers=headers, error=str(e))
+
+        content_type = headers.get("Content-Type", "").split(";")[0].strip().lower()
+        if content_type and content_type not in content_types:
+            return FetchedPage(
+                url,
+                final_url=r.url,
+                headers=headers,
+                error=f"Unsupported content type: {content_type}",
+            )
+
+        try:
+            body, truncated = _read_capped(r, max_bytes, deadline_at)
+        except Exception as e:
+            return FetchedPage(url, final_url=r.url, headers=headers, error=str(e))
+
+        return FetchedPage(
+            url,
+            final_url=r.url,
+            headers=headers,
+            html=_decode(body, r.encoding),
+            truncated=truncated,
+        )
+
+
+class LazyPage:
+    """
+    Stands in for a FetchedPage: the page is downloaded on first attribute
+    access (once, even from parallel stages). Collectors served from the
+    cache never touch it, so a fully cached audit skips the download.
+    """
+
+    def __init__(self, url: str, **fetch_kwargs):
+        self.url = url
+        self._fetch_kwargs = fetch_kwargs
+        self._page = None
+        self._lock = threading.Lock()
+
+    @property
+    def fetched(self) -> bool:
+        return self._page is not None
+
+    def get(self) -> FetchedPage:
+        with self._lock:
+            if self._page is None:
+                self._page = fetch_page(self.url, **self._fetch_kwargs)
+        return self._page
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
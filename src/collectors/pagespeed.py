@@ -1,16 +1,78 @@
 import requests
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
+from collectors.cache import cached_collector
+
 # Load environment variables
 load_dotenv()
 
 PAGESPEED_API_KEY = os.getenv("PAGESPEED_API_KEY")
+PAGESPEED_API_URL = "https://www.googleapis.com/pagespeedonline/v5/runPagespeed"
+
+STRATEGIES = ["mobile", "desktop"]
+VITALS = ["fcp", "lcp", "tbt", "cls"]
+
+
+@cached_collector("pagespeed", skip_if=lambda r: r is None or r["score"] is None)
+def _run_strategy(url: str, strategy: str, category: str = "performance") -> dict | None:
+    """
+    One Lighthouse run for one strategy, cached per normalized URL,
+    strategy and category (CACHE_TTL_PAGESPEED). Failed runs are not
+    cached, so a timed-out strategy is retried on the next audit while
+    the other one is served from the cache.
+    Returns {"score", "fcp", "lcp", "tbt", "cls"} or None on failure.
+    """
+    try:
+        response = requests.get(
+            PAGESPEED_API_URL,
+            params={
+                "url": url,
+                "strategy": strategy,
+                "category": category,
+                "key": PAGESPEED_API_KEY,
+            },
+            timeout=20,
+        )
+        response.raise_for_status()
+        data = response.json()
+    except Exception as e:
+        print(f"PageSpeed API error ({strategy}):", e, file=sys.stderr)
+        return None
 
+    lighthouse = data.get("lighthouseResult", {})
+    categories = lighthouse.get("categories", {})
+    audits = lighthouse.get("audits", {})
 
-def get_website_performance(url: str) -> dict:
+    score = categories.get(category, {}).get("score")
+    if score is not None:
+        score = round(score * 100, 2)
+
+    # Core Web Vitals (convert ms → seconds where needed)
+    def audit_value(key):
+        val = audits.get(key, {}).get("numericValue")
+        if val is not None:
+            return round(val / 1000, 2)
+        return None
+
+    return {
+        "score": score,
+        "fcp": audit_value("first-contentful-paint"),
+        "lcp": audit_value("largest-contentful-paint"),
+        "tbt": audit_value("total-blocking-time"),
+        "cls": audits.get("cumulative-layout-shift", {}).get("numericValue"),
+    }
+
+
+def get_website_performance(url: str, refresh: bool = False) -> dict:
     """
     Fetches PageSpeed Insights and Core Web Vitals.
+    Mobile and desktop run in parallel; vitals are kept per strategy
+    (mobile_lcp, desktop_lcp, ...). The unprefixed fcp/lcp/tbt/cls use the
+    mobile run, falling back to desktop when mobile failed.
+    Each strategy is cached on its own; refresh=True re-runs both.
     """
 
     result = {
@@ -21,48 +83,29 @@ def get_website_performance(url: str) -> dict:
         "tbt": None,
         "cls": None,
     }
+    for strategy in STRATEGIES:
+        for vital in VITALS:
+            result[f"{strategy}_{vital}"] = None
 
     if not PAGESPEED_API_KEY:
-        print("PageSpeed API key missing")
+        print("PageSpeed API key missing", file=sys.stderr)
         return result
 
-    for strategy in ["mobile", "desktop"]:
-        api_url = (
-            "https://www.googleapis.com/pagespeedonline/v5/runPagespeed"
-            f"?url={url}&strategy={strategy}&category=performance&key={PAGESPEED_API_KEY}"
-        )
+    with ThreadPoolExecutor(max_workers=len(STRATEGIES)) as pool:
+        runs = dict(zip(STRATEGIES, pool.map(lambda s: _run_strategy(url, s, refresh=refresh), STRATEGIES)))
 
-        try:
-            response = requests.get(api_url, timeout=20)
-            response.raise_for_status()
-            data = response.json()
-        except Exception as e:
-            print(f"PageSpeed API error ({strategy}):", e)
+    for strategy in STRATEGIES:
+        metrics = runs[strategy]
+        if not metrics:
             continue
 
-        lighthouse = data.get("lighthouseResult", {})
-        categories = lighthouse.get("categories", {})
-        audits = lighthouse.get("audits", {})
-
-        score = categories.get("performance", {}).get("score")
-        if score is not None:
-            score = round(score * 100, 2)
-
-        if strategy == "mobile":
-            result["psi_mobile_score"] = score
-        else:
-            result["psi_desktop_score"] = score
-
-        # Core Web Vitals (convert ms → seconds where needed)
-        def audit_value(key):
-            val = audits.get(key, {}).get("numericValue")
-            if val is not None:
-                return round(val / 1000, 2)
-            return None
-
-        result["fcp"] = audit_value("first-contentful-paint")
-        result["lcp"] = audit_value("largest-contentful-paint")
-        result["tbt"] = audit_value("total-blocking-time")
-        result["cls"] = audits.get("cumulative-layout-shift", {}).get("numericValue")
+        result[f"psi_{strategy}_score"] = metrics["score"]
+        for vital in VITALS:
+            result[f"{strategy}_{vital}"] = metrics[vital]
+
+    primary = runs["mobile"] or runs["desktop"]
+    if primary:
+        for vital in VITALS:
+            result[vital] = primary[vital]
 
     return result
@@ -0,0 +1,251 @@
+# collectors/review_analytics.py
+# Columnar review stats for the Google and Facebook collectors: reviews are
+# normalized into columns and summarized with pandas in one vectorized pass
+# (per business when several are analyzed together). pandas/numpy are
+# imported on first use.
+
+# Candidate actor fields per canonical column, in priority order
+REVIEW_FIELDS = {
+    "google": {
+        "rating": ["rating", "stars", "reviewRating"],
+        "published": ["publishedAtDate", "publishedAt", "date"],
+        "reply": ["ownerResponse", "response", "reviewReply", "responseFromOwnerText"],
+        "reply_time": ["responseFromOwnerDate", "ownerResponseDate", "responseDate"],
+    },
+    "facebook": {
+        "recommended": ["recommended", "is_recommended", "isRecommended", "recommendation", "recommendationType"],
+        "rating": ["rating", "stars"],
+        "published": ["date", "publishedAt", "time"],
+        "reply": ["response", "ownerResponse", "reply"],
+        "reply_time": ["responseDate", "ownerResponseDate", "replyDate"],
+    },
+}
+
+TRUE_WORDS = ["true", "yes", "y", "recommended", "positive", "recommend"]
+FALSE_WORDS = ["false", "no", "n", "not recommended", "not_recommended", "negative", "notrecommend"]
+
+# Rating trend windows (days back from now)
+TREND_WINDOW_DAYS = 90
+TREND_YEAR_DAYS = 365
+
+
+def source_fields(source: str) -> list[str]:
+    """
+    Every raw field the analysis reads (for dataset field projection).
+    """
+    return [f for fields in REVIEW_FIELDS[source].values() for f in fields]
+
+
+def empty_review_stats(source: str) -> dict:
+    stats = {
+        f"{source}_reviews_total": None,
+        f"{source}_reviews_positive": None,
+        f"{source}_reviews_negative": None,
+    }
+    if source == "facebook":
+        stats["facebook_reviews_unknown"] = None
+    stats.update({
+        f"{source}_reply_rate": None,
+        f"{source}_avg_response_time": None,
+        f"{source}_median_response_time": None,
+        f"{source}_rating_trend": None,
+    })
+    return stats
+
+
+# --------------------------------------------------
+# NORMALIZATION
+# --------------------------------------------------
+class ReviewColumns:
+    """
+    Append-only column buffer: keeps only the canonical fields of each
+    review (first non-empty candidate), not the whole actor item.
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+        self.fields = REVIEW_FIELDS[source]
+        self.columns = {name: [] for name in self.fields}
+
+    def __len__(self) -> int:
+        return len(self.columns["rating"])
+
+    def append(self, review: dict):
+        for name, candidates in self.fields.items():
+            value = None
+            for field in candidates:
+                value = review.get(field)
+                if value is not None and value != "":
+                    break
+            self.columns[name].append(value)
+
+    def frame(self):
+        import pandas as pd
+        return pd.DataFrame(self.columns)
+
+
+def reviews_to_frame(reviews: list, source: str):
+    """
+    Canonical columns for a list of raw review dicts. Built with
+    DataFrame.from_records, then coalesced column by column (no per-review loop).
+    """
+    import pandas as pd
+
+    fields = REVIEW_FIELDS[source]
+    raw = pd.DataFrame.from_records(reviews, columns=source_fields(source))
+
+    out = {}
+    for name, candidates in fields.items():
+        merged = None
+        for field in candidates:
+            col = raw[field]
+            present = col.notna() & (col != "")
+            if not present.any():
+                continue
+            col = col.where(present)
+            merged = col if merged is None else merged.where(merged.notna(), col)
+        out[name] = merged if merged is not None else pd.Series(None, index=raw.index, dtype=object)
+    return pd.DataFrame(out)
+
+
+# --------------------------------------------------
+# ANALYSIS
+# --------------------------------------------------
+def _derive(frame, now):
+    """
+    Adds positive/negative/replied/response_hours and windowed rating
+    columns to a canonical frame.
+    """
+    import numpy as np
+    import pandas as pd
+
+    rating = pd.to_numeric(frame["rating"], errors="coerce")
+
+    if "recommended" in frame:
+        words = frame["recommended"].astype(str).str.strip().str.lower()
+        rec_true = words.isin(TRUE_WORDS).to_numpy()
+        rec_false = words.isin(FALSE_WORDS).to_numpy()
+    else:
+        rec_true = rec_false = np.zeros(len(frame), dtype=bool)
+
+    no_rec = ~(rec_true | rec_false)
+    rating_np = rating.to_numpy(dtype=float)
+
+    reply = frame["reply"]
+    replied = (reply.notna() & reply.astype(bool)).to_numpy()
+
+    published = pd.to_datetime(frame["published"], utc=True, errors="coerce", format="ISO8601")
+    reply_time = pd.to_datetime(frame["reply_time"], utc=True, errors="coerce", format="ISO8601")
+
+    hours = (reply_time - published).dt.total_seconds().to_numpy() / 3600
+    hours = np.where(hours >= 0, hours, np.nan)
+
+    age_days = (now - published).dt.total_seconds().to_numpy() / 86400
+
+    return pd.DataFrame({
+        "group": frame["group"].to_numpy(),
+        "positive": rec_true | (no_rec & (rating_np >= 4)),
+        "negative": rec_false | (no_rec & (rating_np <= 2)),
+        "replied": replied,
+        "response_hours": hours,
+        "rating_last": np.where(age_days < TREND_WINDOW_DAYS, rating_np, np.nan),
+        "rating_prev": np.where(
+            (age_days >= TREND_WINDOW_DAYS) & (age_days < 2 * TREND_WINDOW_DAYS), rating_np, np.nan
+        ),
+        "rating_year": np.where(age_days < TREND_YEAR_DAYS, rating_np, np.nan),
+    })
+
+
+def _num(x, digits: int = 2):
+    """
+    numpy scalar -> plain rounded float (None for NaN), JSON-safe.
+    """
+    x = float(x)
+    return None if x != x else round(x, digits)
+
+
+def summarize_frame(frame, source: str, now=None) -> dict:
+    """
+    {group: stats} for a canonical frame with a `group` column.
+    """
+    import pandas as pd
+
+    if frame.empty:
+        return {}
+
+    now = now if now is not None else pd.Timestamp.now(tz="UTC")
+    derived = _derive(frame, now)
+
+    agg = derived.groupby("group", sort=False).agg(
+        total=("positive", "size"),
+        positive=("positive", "sum"),
+        negative=("negative", "sum"),
+        replied=("replied", "sum"),
+        avg_hours=("response_hours", "mean"),
+        median_hours=("response_hours", "median"),
+        rating_last=("rating_last", "mean"),
+        rating_prev=("rating_prev", "mean"),
+        rating_year=("rating_year", "mean"),
+    )
+
+    results = {}
+    for group, row in zip(agg.index, agg.itertuples(index=False)):
+        total = int(row.total)
+        last, prev = _num(row.rating_last), _num(row.rating_prev)
+
+        stats = {
+            f"{source}_reviews_total": total,
+            f"{source}_reviews_positive": int(row.positive),
+            f"{source}_reviews_negative": int(row.negative),
+        }
+        if source == "facebook":
+            stats["facebook_reviews_unknown"] = total - int(row.positive) - int(row.negative)
+        stats.update({
+            f"{source}_reply_rate": round(int(row.replied) / total * 100, 2),
+            # hours from review to owner reply
+            f"{source}_avg_response_time": _num(row.avg_hours, 1),
+            f"{source}_median_response_time": _num(row.median_hours, 1),
+            f"{source}_rating_trend": {
+                f"last_{TREND_WINDOW_DAYS}d": last,
+                f"prev_{TREND_WINDOW_DAYS}d": prev,
+                f"last_{TREND_YEAR_DAYS}d": _num(row.rating_year),
+                "change": round(last - prev, 2) if last is not None and prev is not None else None,
+            },
+        })
+        results[group] = stats
+
+    return results
+
+
+def analyze_reviews(reviews, source: str) -> dict:
+    """
+    Stats for one business. `reviews` is a list of raw review dicts or
+    a filled ReviewColumns buffer.
+    """
+    if not reviews:
+        return empty_review_stats(source)
+
+    frame = reviews.frame() if isinstance(reviews, ReviewColumns) else reviews_to_frame(reviews, source)
+    frame["group"] = 0
+    return summarize_frame(frame, source)[0]
+
+
+def analyze_reviews_batch(groups: dict, source: str) -> dict:
+    """
+    Stats for many businesses at once: {key: [reviews]} -> {key: stats}.
+    All reviews go into one frame and are aggregated with a single groupby.
+    """
+    import numpy as np
+
+    keys = [k for k, reviews in groups.items() if reviews]
+    results = {k: empty_review_stats(source) for k in groups}
+    if not keys:
+        return results
+
+    records = [r for k in keys for r in groups[k]]
+    frame = reviews_to_frame(records, source)
+    frame["group"] = np.repeat(np.arange(len(keys)), [len(groups[k]) for k in keys])
+
+    for i, stats in summarize_frame(frame, source).items():
+        results[keys[i]] = stats
+    return results
@@ -1,18 +1,7 @@
-import os
 from urllib.parse import urlparse
-from dotenv import load_dotenv
-from apify_client import ApifyClient
 
-# --------------------------------------------------
-# ENV
-# --------------------------------------------------
-load_dotenv()
-
-APIFY_API_TOKEN = os.getenv("APIFY_API_TOKEN")
-if not APIFY_API_TOKEN:
-    raise RuntimeError("APIFY_API_TOKEN missing")
-
-client = ApifyClient(APIFY_API_TOKEN)
+from collectors.cache import cached_collector
+from utils.apify import get_apify_client
 
 
 # --------------------------------------------------
@@ -36,35 +25,48 @@ def rank_to_visibility(rank: int) -> float:
     return 0.0
 
 
-# --------------------------------------------------
-# MAIN FUNCTION
-# --------------------------------------------------
-def get_seo_visibility(
-    website_url: str,
-    keywords: list[str],
-    geo_hint: str = "",
-    country_code: str = "us",
-):
-    target_domain = normalize_domain(website_url)
+def _build_queries(keywords: list[str], geo_hint: str = "") -> list[str]:
+    return [f"{kw} {geo_hint}".strip() for kw in keywords]
+
 
+def _run_serp(queries: list[str], country_code: str = "us", language_code: str = "en") -> list:
     # ✅ Apify expects newline-separated string
-    query_string = "\n".join(
-        [f"{kw} {geo_hint}".strip() for kw in keywords]
-    )
+    query_string = "\n".join(queries)
 
+    client = get_apify_client()
     run = client.actor("apify/google-search-scraper").call(
         run_input={
             "queries": query_string,
             "resultsPerPage": 20,
             "maxPagesPerQuery": 4,   # ≈ Top 50–60
             "countryCode": country_code,
-            "languageCode": "en",
+            "languageCode": language_code,
             "mobileResults": False,
         }
     )
 
-    items = client.dataset(run["defaultDatasetId"]).list_items().items
+    return client.dataset(run["defaultDatasetId"]).list_items().items
+
+
+def _rank_in_results(organic_results: list, target_domain: str) -> int:
+    for idx, result in enumerate(organic_results, start=1):
+        result_url = result.get("url", "")
+        if not result_url:
+            continue
+
+        result_domain = normalize_domain(result_url)
+
+        if target_domain in result_domain:
+            return idx
+
+    return 0
+
 
+def _visibility_from_items(items: list, target_domain: str, queries: set | None = None) -> dict:
+    """
+    Turns SERP items into keyword rankings for one domain.
+    `queries` restricts the items to the ones this site asked for.
+    """
     keyword_rankings = {}
     keyword_visibility = {}
 
@@ -74,20 +76,10 @@ def get_seo_visibility(
 
         if not query_text:
             continue
+        if queries is not None and query_text not in queries:
+            continue
 
-        organic_results = item.get("organicResults", [])
-        rank = 0
-
-        for idx, result in enumerate(organic_results, start=1):
-            result_url = result.get("url", "")
-            if not result_url:
-                continue
-
-            result_domain = normalize_domain(result_url)
-
-            if target_domain in result_domain:
-                rank = idx
-                break
+        rank = _rank_in_results(item.get("organicResults", []), target_domain)
 
         keyword_rankings[query_text] = rank
         keyword_visibility[query_text] = rank_to_visibility(rank)
@@ -102,3 +94,73 @@ def get_seo_visibility(
         "keyword_visibility": keyword_visibility,
         "visibility_score": visibility_score,
     }
+
+
+# --------------------------------------------------
+# MAIN FUNCTION
+# --------------------------------------------------
+@cached_collector("seo_visibility", skip_if=lambda r: not r["keyword_rankings"])
+def get_seo_visibility(
+    website_url: str,
+    keywords: list[str],
+    geo_hint: str = "",
+    country_code: str = "us",
+):
+    target_domain = normalize_domain(website_url)
+
+    items = _run_serp(_build_queries(keywords, geo_hint), country_code=country_code)
+
+    return _visibility_from_items(items, target_domain)
+
+
+# --------------------------------------------------
+# BATCH (MANY SITES, ONE ACTOR RUN PER COUNTRY/LANGUAGE)
+# --------------------------------------------------
+def get_seo_visibility_batch(jobs: list[dict], max_queries_per_run: int = 1000) -> list[dict]:
+    """
+    SERP visibility for many sites at once.
+
+    Each job is a dict with `website_url` and `keywords`, plus optional
+    `geo_hint`, `country_code` (default "us") and `language_code` (default "en").
+    Jobs are grouped by country and language, identical query strings are
+    fetched once, and each group is sent as a single actor run (split only
+    above `max_queries_per_run`). Results are returned in job order, in the
+    same shape as get_seo_visibility().
+    """
+    groups = {}
+    job_queries = []
+
+    for job in jobs:
+        queries = _build_queries(job.get("keywords") or [], job.get("geo_hint", ""))
+        job_queries.append(list(dict.fromkeys(queries)))
+
+        key = (job.get("country_code") or "us", job.get("language_code") or "en")
+        group = groups.setdefault(key, {})   # dict keeps first-seen order, dedupes
+        for q in queries:
+            group[q] = True
+
+    items_by_query = {}
+
+    for (country_code, language_code), group in groups.items():
+        unique = list(group)
+        for start in range(0, len(unique), max_queries_per_run):
+            chunk = unique[start:start + max_queries_per_run]
+            for item in _run_serp(chunk, country_code, language_code):
+                q = item.get("searchQuery", {}).get("q")
+                if q:
+                    items_by_query.setdefault((country_code, language_code, q), []).append(item)
+
+    results = []
+
+    for job, queries in zip(jobs, job_queries):
+        key = (job.get("country_code") or "us", job.get("language_code") or "en")
+        items = [
+            item
+            for q in queries
+            for item in items_by_query.get((*key, q), [])
+        ]
+        results.append(
+            _visibility_from_items(items, normalize_domain(job["website_url"]), set(queries))
+        )
+
+    return results
@@ -0,0 +1,182 @@
+# collectors/site_crawler.py
+import os
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urljoin, urlsplit
+
+from collectors.page_fetch import FetchedPage, fetch_page
+from utils.urls import normalize_url
+
+# Off by default: extract_business_info(..., crawl=True) or BUSINESS_INFO_CRAWL=1
+CRAWL_ENABLED = os.getenv("BUSINESS_INFO_CRAWL", "0") not in ("0", "false", "False")
+CRAWL_MAX_PAGES = int(os.getenv("CRAWL_MAX_PAGES", "4"))
+CRAWL_TIME_BUDGET = float(os.getenv("CRAWL_TIME_BUDGET", "8"))
+CRAWL_PER_HOST = int(os.getenv("CRAWL_PER_HOST", "3"))
+CRAWL_PAGE_MAX_BYTES = int(os.getenv("CRAWL_PAGE_MAX_BYTES", str(1024 * 1024)))
+
+# Where address / hours / phone usually live, by how likely they are there
+PAGE_HINTS = {
+    "contact": 5,
+    "location": 4,
+    "find-us": 4,
+    "visit": 3,
+    "hours": 3,
+    "directions": 3,
+    "about": 2,
+}
+
+SKIP_EXTENSIONS = (".pdf", ".jpg", ".jpeg", ".png", ".gif", ".svg", ".webp", ".zip", ".xml", ".mp4")
+SITEMAP_TYPES = ("application/xml", "text/xml", "text/plain")
+LOC_RE = re.compile(r"<loc>\s*([^<\s]+)\s*</loc>", re.IGNORECASE)
+
+
+def _site_host(url: str) -> str:
+    host = (urlsplit(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def _hint_score(url: str, text: str = "") -> int:
+    haystack = urlsplit(url).path.lower() + " " + text.lower()
+    return max((w for hint, w in PAGE_HINTS.items() if hint in haystack), default=0)
+
+
+def _is_page_link(url: str, site: str) -> bool:
+    parts = urlsplit(url)
+    return (
+        parts.scheme in ("http", "https")
+        and _site_host(url) == site
+        and not parts.path.lower().endswith(SKIP_EXTENSIONS)
+    )
+
+
+def _canonical(page: FetchedPage) -> str:
+    """
+    <link rel="canonical"> if the page declares one, else its final URL.
+    """
+    link = page.soup.find("link", rel="canonical", href=True)
+    href = urljoin(page.final_url, link["href"]) if link else page.final_url
+    return normalize_url(href.split("?")[0])
+
+
+def find_candidate_pages(page: FetchedPage) -> list[tuple[int, str]]:
+    """
+    High-value internal pages linked from the homepage, best first.
+    """
+    site = _site_host(page.final_url)
+    scores = {}
+
+    for link in page.soup.find_all("a", href=True):
+        url = urljoin(page.final_url, link["href"].strip()).split("#")[0]
+        if not _is_page_link(url, site):
+            continue
+        score = _hint_score(url, link.get_text(" ", strip=True))
+        if score:
+            key = normalize_url(url)
+            scores[key] = max(score, scores.get(key, 0))
+
+    return sorted(((s, u) for u, s in scores.items()), key=lambda x: -x[0])
+
+
+def _sitemap_candidates(page: FetchedPage, timeout: float) -> list[tuple[int, str]]:
+    """
+    Hint-matching URLs from /sitemap.xml (index files are not followed).
+    """
+    sitemap = fetch_page(
+        urljoin(page.final_url, "/sitemap.xml"),
+        timeout=timeout,
+        max_bytes=CRAWL_PAGE_MAX_BYTES,
+        deadline=timeout,
+        content_types=SITEMAP_TYPES,
+    )
+    if not sitemap.ok or "<sitemapindex" in sitemap.html_lower:
+        return []
+
+    site = _site_host(page.final_url)
+    found = []
+    for url in LOC_RE.findall(sitemap.html):
+        score = _hint_score(url)
+        if score and _is_page_link(url, site):
+            found.append((score, normalize_url(url)))
+
+    return sorted(found, key=lambda x: -x[0])
+
+
+def crawl_site(
+    page: FetchedPage,
+    max_pages: int = CRAWL_MAX_PAGES,
+    time_budget: float = CRAWL_TIME_BUDGET,
+    per_host: int = CRAWL_PER_HOST,
+) -> list[FetchedPage]:
+    """
+    Fetches up to `max_pages` contact/location/about pages of the site the
+    homepage belongs to, in parallel, within `time_budget` seconds.
+    Candidates come from homepage links and sitemap.xml. Every fetch is
+    to the audited site, so the pool size is the per-host cap. Pages are
+    deduplicated by canonical URL (the homepage included) and returned
+    best hint first; fetches still running at the deadline are dropped.
+    """
+    if not page.ok or max_pages <= 0:
+        return []
+
+    deadline_at = time.monotonic() + time_budget
+    seen = {normalize_url(page.url), normalize_url(page.final_url)}
+    queued = []
+
+    def enqueue(candidates):
+        for score, url in candidates:
+            if url not in seen:
+                seen.add(url)
+                queued.append((score, url))
+        queued.sort(key=lambda x: -x[0])
+
+    enqueue(find_candidate_pages(page))
+
+    canonicals = {_canonical(page)}
+    results = []
+    submitted = 0
+
+    pool = ThreadPoolExecutor(max_workers=max(1, per_host), thread_name_prefix="crawl")
+    try:
+        remaining = time_budget
+        sitemap_future = pool.submit(_sitemap_candidates, page, min(remaining, 5))
+        running = {sitemap_future: None}
+
+        while True:
+            while queued and submitted < max_pages:
+                score, url = queued.pop(0)
+                remaining = deadline_at - time.monotonic()
+                running[pool.submit(
+                    fetch_page, url,
+                    timeout=max(remaining, 0.1),
+                    max_bytes=CRAWL_PAGE_MAX_BYTES,
+                    deadline=max(remaining, 0.1),
+                )] = score
+                submitted += 1
+
+            remaining = deadline_at - time.monotonic()
+            if not running or remaining <= 0:
+                break
+
+            done, _ = wait(running, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                score = running.pop(future)
+
+                if future is sitemap_future:
+                    enqueue(future.result())
+                    continue
+
+                fetched = future.result()
+                if not fetched.ok:
+                    continue
+
+                canonical = _canonical(fetched)
+                if canonical in canonicals:
+                    continue
+                canonicals.add(canonical)
+                results.append((score, fetched))
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    results.sort(key=lambda x: -x[0])
+    return [p for _, p in results]
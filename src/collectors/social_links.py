@@ -1,14 +1,8 @@
 # collectors/social_links.py
 import re
-import requests
-from bs4 import BeautifulSoup
 
-UA = (
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-)
-
-HEADERS = {"User-Agent": UA, "Accept-Language": "en-US,en;q=0.9"}
+from collectors.cache import cached_collector
+from collectors.page_fetch import FetchedPage, fetch_page
 
 def _clean_fb(url: str) -> str | None:
     if not url:
@@ -27,15 +21,16 @@ def _clean_fb(url: str) -> str | None:
         return u
     return None
 
-def extract_facebook_url(website_url: str) -> str | None:
-    try:
-        r = requests.get(website_url, headers=HEADERS, timeout=20, allow_redirects=True)
-        r.raise_for_status()
-        html = r.text
-    except Exception:
+@cached_collector("social_links", skip_if=lambda r: r is None)
+def extract_facebook_url(website_url: str, page: FetchedPage | None = None) -> str | None:
+    if page is None:
+        page = fetch_page(website_url)
+
+    if not page.ok:
         return None
 
-    soup = BeautifulSoup(html, "html.parser")
+    html = page.html
+    soup = page.soup
 
     # 1) direct anchors
     for a in soup.find_all("a", href=True):
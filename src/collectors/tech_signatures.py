@@ -0,0 +1,257 @@
+# collectors/tech_signatures.py
+import json
+import os
+import re
+import sys
+
+# --------------------------------------------------
+# CATALOG
+# --------------------------------------------------
+# One entry per technology. Every field except name/category is optional:
+#   domains  hosts (or parent domains) referenced anywhere in the HTML
+#   tokens   identifiers in inline HTML/JS (lowercase, no dots)
+#   ids      regex for an account ID, matched case-sensitively
+#   meta     {meta name: [tokens in its content]}
+#   headers  {header name: [tokens in its value]}, [] = header present
+#   flag     legacy boolean key of detect_tech_stack
+#
+# Extra entries in the same shape can be loaded from a JSON file
+# (TECH_SIGNATURES_PATH) without touching the code.
+TECH_SIGNATURES = [
+    # ---------------- tag managers / analytics ----------------
+    {"name": "Google Tag Manager", "category": "tag_manager",
+     "ids": r"GTM-[A-Z0-9]{4,9}", "flag": "gtm"},
+    {"name": "Google Universal Analytics", "category": "analytics",
+     "ids": r"UA-\d{4,10}-\d{1,4}", "flag": "ga_ua"},
+    {"name": "Google Analytics 4", "category": "analytics",
+     "ids": r"G-[A-Z0-9]{6,12}", "flag": "ga4"},
+    {"name": "Microsoft Clarity", "category": "analytics", "domains": ["clarity.ms"]},
+    {"name": "Hotjar", "category": "analytics", "domains": ["hotjar.com"], "tokens": ["hjsiteid"]},
+    {"name": "Segment", "category": "analytics", "domains": ["cdn.segment.com"]},
+    {"name": "Mixpanel", "category": "analytics", "domains": ["mxpnl.com", "mixpanel.com"]},
+    {"name": "Heap", "category": "analytics", "domains": ["heapanalytics.com"]},
+
+    # ---------------- ad pixels ----------------
+    {"name": "Google Ads", "category": "advertising",
+     "ids": r"AW-\d{6,12}",
+     "domains": ["googleadservices.com", "googleads.g.doubleclick.net"],
+     "flag": "google_ads_pixel"},
+    {"name": "Meta Pixel", "category": "advertising",
+     "domains": ["connect.facebook.net"], "tokens": ["fbq"], "flag": "fb_pixel"},
+    {"name": "Microsoft Advertising UET", "category": "advertising", "domains": ["bat.bing.com"]},
+    {"name": "LinkedIn Insight Tag", "category": "advertising", "domains": ["snap.licdn.com"]},
+    {"name": "TikTok Pixel", "category": "advertising", "domains": ["analytics.tiktok.com"]},
+    {"name": "Pinterest Tag", "category": "advertising", "domains": ["ct.pinterest.com"], "tokens": ["pintrk"]},
+    {"name": "X (Twitter) Pixel", "category": "advertising", "domains": ["static.ads-twitter.com"]},
+
+    # ---------------- chat widgets ----------------
+    {"name": "Tawk.to", "category": "chat", "domains": ["tawk.to"], "tokens": ["tawk_api"], "flag": "chat_widget"},
+    {"name": "Intercom", "category": "chat", "domains": ["intercom.io", "intercomcdn.com"],
+     "tokens": ["intercomsettings"], "flag": "chat_widget"},
+    {"name": "Drift", "category": "chat", "domains": ["driftt.com", "drift.com"], "flag": "chat_widget"},
+    {"name": "Crisp", "category": "chat", "domains": ["crisp.chat"], "flag": "chat_widget"},
+    {"name": "Zendesk Chat", "category": "chat", "domains": ["zdassets.com", "zopim.com"], "flag": "chat_widget"},
+    {"name": "LiveChat", "category": "chat", "domains": ["livechatinc.com"], "flag": "chat_widget"},
+    {"name": "Freshchat", "category": "chat", "domains": ["freshchat.com"], "flag": "chat_widget"},
+    {"name": "Chatwoot", "category": "chat", "domains": ["chatwoot.com"], "tokens": ["chatwootsdk"], "flag": "chat_widget"},
+    {"name": "Olark", "category": "chat", "domains": ["olark.com"], "flag": "chat_widget"},
+    {"name": "HubSpot Chat", "category": "chat", "domains": ["usemessages.com"], "flag": "chat_widget"},
+    {"name": "Podium", "category": "chat", "domains": ["podium.com"], "flag": "chat_widget"},
+
+    # ---------------- CRM / marketing automation ----------------
+    {"name": "HubSpot", "category": "crm",
+     "domains": ["hs-scripts.com", "hsforms.net", "hs-analytics.net"], "tokens": ["_hsq"]},
+    {"name": "Salesforce Pardot", "category": "crm", "domains": ["pardot.com"]},
+    {"name": "Marketo", "category": "crm", "domains": ["marketo.net"]},
+    {"name": "ActiveCampaign", "category": "crm", "domains": ["trackcmp.net"]},
+    {"name": "HighLevel", "category": "crm", "domains": ["leadconnectorhq.com", "msgsndr.com"]},
+    {"name": "Keap", "category": "crm", "domains": ["infusionsoft.com"]},
+    {"name": "Mailchimp", "category": "email", "domains": ["chimpstatic.com", "list-manage.com"]},
+    {"name": "Klaviyo", "category": "email", "domains": ["klaviyo.com"]},
+    {"name": "Constant Contact", "category": "email", "domains": ["ctctcdn.com"]},
+
+    # ---------------- call tracking ----------------
+    {"name": "CallRail", "category": "call_tracking", "domains": ["callrail.com"]},
+    {"name": "CallTrackingMetrics", "category": "call_tracking", "domains": ["tctm.co"]},
+    {"name": "Invoca", "category": "call_tracking", "domains": ["invocacdn.com"]},
+    {"name": "WhatConverts", "category": "call_tracking", "domains": ["iconnode.com"]},
+
+    # ---------------- booking / scheduling ----------------
+    {"name": "Calendly", "category": "booking", "domains": ["calendly.com"]},
+    {"name": "Acuity Scheduling", "category": "booking", "domains": ["acuityscheduling.com"]},
+    {"name": "Housecall Pro", "category": "booking", "domains": ["housecallpro.com"]},
+    {"name": "ServiceTitan", "category": "booking", "domains": ["servicetitan.com"]},
+    {"name": "Jobber", "category": "booking", "domains": ["getjobber.com"]},
+    {"name": "OpenTable", "category": "booking", "domains": ["opentable.com"]},
+    {"name": "Mindbody", "category": "booking", "domains": ["mindbodyonline.com"]},
+
+    # ---------------- reviews widgets ----------------
+    {"name": "Trustpilot", "category": "reviews", "domains": ["trustpilot.com"]},
+    {"name": "Birdeye", "category": "reviews", "domains": ["birdeye.com"]},
+    {"name": "Yotpo", "category": "reviews", "domains": ["yotpo.com"]},
+    {"name": "Elfsight", "category": "reviews", "domains": ["elfsight.com", "elfsightcdn.com"]},
+
+    # ---------------- CMS / site builders / e-commerce ----------------
+    {"name": "WordPress", "category": "cms", "tokens": ["wp-content", "wp-includes"],
+     "meta": {"generator": ["wordpress"]}},
+    {"name": "Wix", "category": "cms", "domains": ["wixstatic.com", "parastorage.com"],
+     "meta": {"generator": ["wix"]}, "headers": {"x-wix-request-id": []}},
+    {"name": "Squarespace", "category": "cms", "domains": ["squarespace.com", "squarespace-cdn.com"]},
+    {"name": "Webflow", "category": "cms", "domains": ["website-files.com"], "meta": {"generator": ["webflow"]}},
+    {"name": "Duda", "category": "cms", "domains": ["multiscreensite.com"]},
+    {"name": "Joomla", "category": "cms", "meta": {"generator": ["joomla"]}},
+    {"name": "Drupal", "category": "cms", "meta": {"generator": ["drupal"]}, "headers": {"x-generator": ["drupal"]}},
+    {"name": "Shopify", "category": "ecommerce", "domains": ["cdn.shopify.com"], "headers": {"x-shopid": []}},
+    {"name": "WooCommerce", "category": "ecommerce", "tokens": ["woocommerce"]},
+
+    # ---------------- hosting / CDN ----------------
+    {"name": "Cloudflare", "category": "cdn", "headers": {"cf-ray": []}},
+    {"name": "WP Engine", "category": "hosting", "headers": {"x-powered-by": ["engine"]}},
+]
+
+TECH_SIGNATURES_PATH = os.getenv("TECH_SIGNATURES_PATH")
+
+# Hosts in URL-like contexts only: after // (src/href/inline JS URLs), or
+# a quoted scheme-less loader path ('cdn.x.com/loader.js'). Bare hosts in
+# visible text ("find us on podium.com") are not script evidence.
+_HOST = r"((?:[a-z0-9-]+\.)+[a-z][a-z0-9-]*[a-z])"
+# (two patterns, not one alternation: each keeps re's fast first-char scan)
+HOST_RE = re.compile(rf"//{_HOST}(?![a-z0-9-])")
+QUOTED_HOST_RE = re.compile(rf"""['"]{_HOST}/""")
+# words in meta/header values
+TOKEN_RE = re.compile(r"[a-z_$][a-z0-9_$-]*")
+
+MAX_EVIDENCE = 3
+
+
+def _tokens(text: str) -> set:
+    return set(TOKEN_RE.findall(text.lower()))
+
+
+def _standalone(text: str, start: int, end: int) -> bool:
+    """
+    True when text[start:end] is not part of a longer identifier.
+    """
+    before = text[start - 1] if start > 0 else " "
+    after = text[end] if end < len(text) else " "
+    return not (before.isalnum() or before in "_$-" or after.isalnum() or after in "_$-")
+
+
+class SignatureMatcher:
+    """
+    The catalog compiled once. Hosts are extracted from the page and
+    looked up (with their parent domains) in a dict, so the domain part of
+    the catalog - most of it - costs nothing per entry. Tokens and account
+    IDs each go through one combined literal-prefixed pattern; matches are
+    mapped back to their signatures through dicts.
+    """
+
+    def __init__(self, signatures: list[dict]):
+        self.signatures = signatures
+        self.domains = {}
+        self.tokens = {}
+        self.meta = {}
+        self.headers = {}
+
+        self.id_patterns = []
+
+        for i, sig in enumerate(signatures):
+            for domain in sig.get("domains", []):
+                self.domains.setdefault(domain.lower(), []).append(i)
+            for token in sig.get("tokens", []):
+                self.tokens.setdefault(token.lower(), []).append(i)
+            for name, tokens in sig.get("meta", {}).items():
+                index = self.meta.setdefault(name.lower(), {})
+                for token in tokens:
+                    index.setdefault(token.lower(), []).append(i)
+            for name, tokens in sig.get("headers", {}).items():
+                index = self.headers.setdefault(name.lower(), {})
+                for token in tokens or ["*"]:
+                    index.setdefault(token.lower(), []).append(i)
+            if sig.get("ids"):
+                self.id_patterns.append((i, re.compile(sig["ids"])))
+
+        # no named groups / leading \b: keeps the literal-prefix fast path of re
+        self.token_re = self._alternation(re.escape(t) for t in sorted(self.tokens, key=len, reverse=True))
+        self.id_re = self._alternation(p.pattern for _, p in self.id_patterns)
+
+    @staticmethod
+    def _alternation(patterns):
+        patterns = list(patterns)
+        return re.compile("|".join(f"(?:{p})" for p in patterns)) if patterns else None
+
+    def match(self, html: str, html_lower: str, meta: dict, headers: dict) -> dict:
+        """
+        Returns {signature index: [evidence, ...]} for every match.
+        `meta` maps lowercased meta names to their content.
+        """
+        found = {}
+
+        def hit(indexes, evidence):
+            for i in indexes:
+                items = found.setdefault(i, [])
+                if len(items) < MAX_EVIDENCE and evidence not in items:
+                    items.append(evidence)
+
+        # hosts, walking up parent domains: a.b.example.com -> ... -> example.com
+        # (JSON-escaped URLs such as https:\/\/embed.tawk.to are unescaped first)
+        text = html_lower.replace("\\/", "/")
+        for host in set(HOST_RE.findall(text)) | set(QUOTED_HOST_RE.findall(text)):
+            labels = host.split(".")
+            for k in range(len(labels) - 1):
+                indexes = self.domains.get(".".join(labels[k:]))
+                if indexes:
+                    hit(indexes, f"host:{host}")
+
+        if self.token_re is not None:
+            for m in self.token_re.finditer(html_lower):
+                if _standalone(html_lower, m.start(), m.end()):
+                    hit(self.tokens[m.group()], f"token:{m.group()}")
+
+        if self.id_re is not None:
+            for m in self.id_re.finditer(html):
+                if not _standalone(html, m.start(), m.end()):
+                    continue
+                found_id = m.group()
+                hit([i for i, p in self.id_patterns if p.fullmatch(found_id)], f"id:{found_id}")
+
+        for name, content in meta.items():
+            index = self.meta.get(name)
+            if index:
+                for token in _tokens(content) & index.keys():
+                    hit(index[token], f"meta:{name}={content[:60]}")
+
+        for name, value in headers.items():
+            index = self.headers.get(name.lower())
+            if not index:
+                continue
+            if "*" in index:
+                hit(index["*"], f"header:{name.lower()}")
+            for token in _tokens(value) & index.keys():
+                hit(index[token], f"header:{name.lower()}={value[:60]}")
+
+        return found
+
+
+def load_signatures(path: str | None = TECH_SIGNATURES_PATH) -> list[dict]:
+    """
+    Built-in catalog plus any extra entries from a JSON file.
+    """
+    signatures = list(TECH_SIGNATURES)
+    if path:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                signatures.extend(json.load(f))
+        except (OSError, ValueError) as e:
+            print("Error loading tech signatures:", e, file=sys.stderr)
+    return signatures
+
+
+_matcher = None
+
+
+def get_matcher() -> SignatureMatcher:
+    global _matcher
+    if _matcher is None:
+        _matcher = SignatureMatcher(load_signatures())
+    return _matcher
@@ -0,0 +1,140 @@
+# jobs/http_api.py
+import argparse
+import json
+import os
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# --------------------------------------------------
+# Fix import path (run as `python src/jobs/http_api.py`)
+# --------------------------------------------------
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT_DIR)
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from jobs.job_queue import JobQueue, SUCCEEDED, FAILED
+from jobs.worker import JOB_WORKERS, WorkerPool
+
+
+def make_handler(queue: JobQueue):
+    """
+    Routes:
+        POST /jobs                {"url": "..."}  -> 202 {"job_id", "status"}
+        GET  /jobs?status=&limit=                 -> recent jobs
+        GET  /jobs/<id>                           -> status + stage progress
+        GET  /jobs/<id>/result                    -> audit result (report paths included)
+        GET  /health
+    """
+
+    class AuditAPIHandler(BaseHTTPRequestHandler):
+
+        def _send(self, status: int, payload):
+            body = json.dumps(payload, default=str).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _read_json(self) -> dict:
+            length = int(self.headers.get("Content-Length") or 0)
+            if not length:
+                return {}
+            return json.loads(self.rfile.read(length).decode("utf-8"))
+
+        def do_POST(self):
+            path = urlparse(self.path).path.rstrip("/")
+            if path != "/jobs":
+                return self._send(404, {"error": "not found"})
+
+            try:
+                body = self._read_json()
+            except ValueError:
+                return self._send(400, {"error": "invalid JSON body"})
+
+            if not isinstance(body, dict):
+                return self._send(400, {"error": "JSON body must be an object"})
+
+            url = body.get("url")
+            url = url.strip() if isinstance(url, str) else ""
+            if not url:
+                return self._send(400, {"error": "'url' is required"})
+
+            job_id = queue.submit(url)
+            self._send(202, {"job_id": job_id, "status": "queued"})
+
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            parts = [p for p in parsed.path.split("/") if p]
+
+            if parts == ["health"]:
+                return self._send(200, {"status": "ok"})
+
+            if parts == ["jobs"]:
+                qs = parse_qs(parsed.query)
+                status = (qs.get("status") or [None])[0]
+                try:
+                    limit = int((qs.get("limit") or ["50"])[0])
+                except ValueError:
+                    return self._send(400, {"error": "'limit' must be an integer"})
+                return self._send(200, {"jobs": queue.list_jobs(status, limit)})
+
+            if len(parts) == 2 and parts[0] == "jobs":
+                job = queue.get(parts[1])
+                if job is None:
+                    return self._send(404, {"error": "job not found"})
+                return self._send(200, job)
+
+            if len(parts) == 3 and parts[0] == "jobs" and parts[2] == "result":
+                job = queue.get(parts[1])
+                if job is None:
+                    return self._send(404, {"error": "job not found"})
+                if job["status"] not in (SUCCEEDED, FAILED):
+                    return self._send(409, {"error": "job not finished", "status": job["status"]})
+
+                result = queue.get_result(parts[1]) or {}
+                return self._send(200, {
+                    "job_id": job["id"],
+                    "status": job["status"],
+                    "error": job["error"],
+                    "html_report_path": result.get("html_report_path"),
+                    "excel_path": result.get("excel_path"),
+                    "result": result,
+                })
+
+            self._send(404, {"error": "not found"})
+
+        def log_message(self, fmt, *args):
+            print(f"[api] {self.address_string()} {fmt % args}")
+
+    return AuditAPIHandler
+
+
+def serve(host: str = "127.0.0.1", port: int = 8000, workers: int = JOB_WORKERS):
+    queue = JobQueue()
+    pool = WorkerPool(queue, size=workers)
+    pool.start()
+
+    server = ThreadingHTTPServer((host, port), make_handler(queue))
+    print(f"[api] listening on http://{host}:{port} with {workers} worker(s)")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        pool.stop(timeout=5)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Audit job queue HTTP API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=JOB_WORKERS)
+    args = parser.parse_args()
+
+    serve(args.host, args.port, args.workers)
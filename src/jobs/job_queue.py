@@ -0,0 +1,175 @@
+# jobs/job_queue.py
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import datetime
+
+JOBS_DB_PATH = os.getenv("JOBS_DB_PATH", os.path.join("data", "jobs.sqlite"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    website TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT,
+    stages TEXT NOT NULL DEFAULT '{}',
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at);
+"""
+
+# queued -> running -> succeeded | failed
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+class JobQueue:
+    """
+    Local persistent audit queue (SQLite, WAL). No external broker needed.
+    Safe to share between the HTTP server and worker threads.
+    """
+
+    def __init__(self, path: str = JOBS_DB_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self._local = threading.local()
+
+        conn = self._conn()
+        conn.executescript(SCHEMA)
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # --------------------------------------------------
+    # PRODUCER
+    # --------------------------------------------------
+    def submit(self, website: str) -> str:
+        job_id = uuid.uuid4().hex
+        self._conn().execute(
+            "INSERT INTO jobs (id, website, status, created_at) VALUES (?, ?, ?, ?)",
+            (job_id, website, QUEUED, _now()),
+        )
+        return job_id
+
+    # --------------------------------------------------
+    # WORKERS
+    # --------------------------------------------------
+    def claim(self) -> dict | None:
+        """
+        Atomically takes the oldest queued job and marks it running.
+        """
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT id, website FROM jobs WHERE status = ? ORDER BY created_at, rowid LIMIT 1",
+                (QUEUED,),
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+
+            conn.execute(
+                "UPDATE jobs SET status = ?, started_at = ? WHERE id = ?",
+                (RUNNING, _now(), row["id"]),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        return {"id": row["id"], "website": row["website"]}
+
+    def update_stage(self, job_id: str, event: dict):
+        """
+        Records a pipeline event (see run_pipeline) as stage progress.
+        """
+        progress = {"status": event["status"]}
+        if "duration" in event:
+            progress["duration"] = event["duration"]
+        if "error" in event:
+            progress["error"] = event["error"]
+
+        self._conn().execute(
+            "UPDATE jobs SET stages = json_set(stages, '$.' || ?, json(?)) WHERE id = ?",
+            (event["stage"], json.dumps(progress), job_id),
+        )
+
+    def complete(self, job_id: str, result: dict):
+        self._conn().execute(
+            "UPDATE jobs SET status = ?, finished_at = ?, result = ? WHERE id = ?",
+            (SUCCEEDED, _now(), json.dumps(result, default=str), job_id),
+        )
+
+    def fail(self, job_id: str, error: str, result: dict | None = None):
+        self._conn().execute(
+            "UPDATE jobs SET status = ?, finished_at = ?, error = ?, result = ? WHERE id = ?",
+            (
+                FAILED,
+                _now(),
+                error,
+                json.dumps(result, default=str) if result is not None else None,
+                job_id,
+            ),
+        )
+
+    def requeue_running(self) -> int:
+        """
+        Puts jobs left 'running' by a crashed process back in the queue.
+        """
+        cur = self._conn().execute(
+            "UPDATE jobs SET status = ?, started_at = NULL, stages = '{}' WHERE status = ?",
+            (QUEUED, RUNNING),
+        )
+        return cur.rowcount
+
+    # --------------------------------------------------
+    # READS
+    # --------------------------------------------------
+    def get(self, job_id: str) -> dict | None:
+        row = self._conn().execute(
+            "SELECT id, website, status, created_at, started_at, finished_at, stages, error "
+            "FROM jobs WHERE id = ?",
+            (job_id,),
+        ).fetchone()
+        if row is None:
+            return None
+
+        job = dict(row)
+        job["stages"] = json.loads(job["stages"])
+        return job
+
+    def get_result(self, job_id: str) -> dict | None:
+        row = self._conn().execute("SELECT result FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None or row["result"] is None:
+            return None
+        return json.loads(row["result"])
+
+    def list_jobs(self, status: str | None = None, limit: int = 50) -> list[dict]:
+        sql = "SELECT id, website, status, created_at, started_at, finished_at, error FROM jobs"
+        params = []
+        if status:
+            sql += " WHERE status = ?"
+            params.append(status)
+        sql += " ORDER BY created_at DESC, rowid DESC LIMIT ?"
+        params.append(limit)
+        return [dict(r) for r in self._conn().execute(sql, params)]
@@ -0,0 +1,74 @@
+# jobs/worker.py
+import os
+import threading
+
+from jobs.job_queue import JobQueue
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+
+
+class WorkerPool:
+    """
+    Threads that take audits from the JobQueue and run them,
+    recording stage progress as the pipeline reports it.
+    """
+
+    def __init__(self, queue: JobQueue, size: int = JOB_WORKERS, audit_fn=None, poll_interval: float = 1.0):
+        if audit_fn is None:
+            from main import run_marketing_audit
+            audit_fn = run_marketing_audit
+
+        self.queue = queue
+        self.size = size
+        self.audit_fn = audit_fn
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self):
+        requeued = self.queue.requeue_running()
+        if requeued:
+            print(f"[jobs] requeued {requeued} interrupted job(s)")
+
+        for i in range(self.size):
+            t = threading.Thread(target=self._loop, name=f"audit-worker-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def stop(self, timeout: float | None = None):
+        self._stop.set()
+        for t in self._threads:
+            t.join(timeout)
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                job = self.queue.claim()
+            except Exception as e:
+                print("[jobs] claim error:", e)
+                job = None
+
+            if job is None:
+                self._stop.wait(self.poll_interval)
+                continue
+
+            self._run(job)
+
+    def _run(self, job: dict):
+        job_id = job["id"]
+
+        def on_event(event):
+            # AI tokens are too chatty to persist; stage start/finish is enough
+            if event["status"] != "token":
+                self.queue.update_stage(job_id, event)
+
+        try:
+            result = self.audit_fn(job["website"], on_event=on_event)
+        except Exception as e:
+            self.queue.fail(job_id, str(e))
+            return
+
+        if result.get("status") == "success":
+            self.queue.complete(job_id, result)
+        else:
+            self.queue.fail(job_id, result.get("error") or "audit failed", result)
@@ -5,6 +5,7 @@ load_dotenv()
 # COLLECTORS
 # ============================================================
 
+from collectors.page_fetch import LazyPage
 from collectors.business_info import extract_business_info
 from collectors.tech_stack import detect_tech_stack
 from collectors.pagespeed import get_website_performance
@@ -14,7 +15,7 @@ from collectors.facebook_reviews import fetch_facebook_reviews
 from collectors.seo_visibility import get_seo_visibility
 
 from report.html_report import generate_html_report
-from storage.excel_store import store_audit_in_excel
+from storage.excel_store import store_audit, export_audit_to_excel
 from utils.geo import detect_country_code
 from utils.keywords import detect_business_type, get_dynamic_keywords
 
@@ -33,6 +34,12 @@ from scoring.report_scores import build_report_scores
 
 from ai.langchain_audit_chain import generate_ai_audit
 
+# ============================================================
+# PIPELINE
+# ============================================================
+
+from pipeline.executor import Stage, run_pipeline
+
 
 # ============================================================
 # 🔑 BUSINESS CONTEXT (CRITICAL FIX)
@@ -72,136 +79,237 @@ def get_dynamic_keywords(business_type: str, business_info: dict) -> list:
 
 
 # ============================================================
-# CORE FUNCTION (UI SAFE)
+# PIPELINE STAGES
 # ============================================================
 
-def run_marketing_audit(website_url: str) -> dict:
-    try:
-        # -----------------------------
-        # STEP 1: BUSINESS INFO
-        # -----------------------------
-        business_info = extract_business_info(website_url)
+def _score_audit(inputs: dict) -> dict:
+    audit_results = {
+        "business_info": inputs["business_info"],
+        "tech_stack": inputs["tech_stack"],
+        "pagespeed": inputs["pagespeed"],
+        "google_reviews": inputs["google_reviews"],
+        "facebook_reviews": inputs["facebook_reviews"],
+        "seo_visibility": inputs["seo_visibility"],
+    }
+
+    section_scores = map_audit_to_scores(audit_results)
+
+    score_result = calculate_marketing_score(section_scores)
+    final_score = score_result["final_score"]
+
+    report_scores = build_report_scores(
+        audit_results=audit_results,
+        section_scores=section_scores,
+        final_score=final_score
+    )
+
+    return {
+        "audit_results": audit_results,
+        "final_score": final_score,
+        "breakdown": score_result["breakdown"],
+        "grade": get_marketing_grade(final_score),
+        "report_scores": report_scores,
+    }
+
+
+def build_audit_stages(
+    website_url: str,
+    export_excel: bool = True,
+    on_event=None,
+    refresh: bool = False,
+) -> list[Stage]:
+    """
+    Audit steps with their real data dependencies.
+    GBP and SEO need business_info, Facebook reviews need the Facebook URL,
+    scoring needs every collector. Storage runs alongside the AI summary.
+    With export_excel=False the audit is only written to the store.
+    With on_event, the AI summary is streamed as "token" events.
+    With refresh=True every collector ignores its cached result.
+    """
+
+    # -----------------------------
+    # STEP 0: HOMEPAGE (SHARED BY HTML COLLECTORS, FETCHED ONLY ON A CACHE MISS)
+    # -----------------------------
+    home = LazyPage(website_url)
+
+    # -----------------------------
+    # STEP 1: BUSINESS INFO
+    # -----------------------------
+    def business_info(_):
+        return extract_business_info(website_url, page=home, refresh=refresh)
+
+    # -----------------------------
+    # STEP 2: TECH STACK
+    # -----------------------------
+    def tech_stack(_):
+        return detect_tech_stack(website_url, page=home, refresh=refresh)
+
+    # -----------------------------
+    # STEP 3: PERFORMANCE
+    # -----------------------------
+    def pagespeed(_):
+        return get_website_performance(website_url, refresh=refresh)
+
+    # -----------------------------
+    # STEP 4: GOOGLE REVIEWS
+    # -----------------------------
+    def google_reviews(d):
+        info = d["business_info"]
+        return fetch_gbp_and_google_reviews(
+            search_term=info.get("business_name", ""),
+            location=info.get("location", ""),
+            target_website=website_url,
+            refresh=refresh
+        )
 
-        # -----------------------------
-        # STEP 2: TECH STACK
-        # -----------------------------
-        tech_stack = detect_tech_stack(website_url)
+    # -----------------------------
+    # STEP 5: FACEBOOK REVIEWS
+    # -----------------------------
+    def facebook_url(_):
+        return extract_facebook_url(website_url, page=home, refresh=refresh)
 
-        # -----------------------------
-        # STEP 3: PERFORMANCE
-        # -----------------------------
-        pagespeed = get_website_performance(website_url)
+    def facebook_reviews(d):
+        url = d["facebook_url"]
+        return fetch_facebook_reviews(url, refresh=refresh) if url else {}
 
-        # -----------------------------
-        # STEP 4: GOOGLE REVIEWS
-        # -----------------------------
-        google_reviews = fetch_gbp_and_google_reviews(
-            search_term=business_info.get("business_name", ""),
-            location=business_info.get("location", "")
-        )
-
-        # -----------------------------
-        # STEP 5: FACEBOOK REVIEWS
-        # -----------------------------
-        facebook_url = extract_facebook_url(website_url)
-        facebook_reviews = fetch_facebook_reviews(facebook_url) if facebook_url else {}
+    # -----------------------------
+    # 🔑 STEP 6: SEO (DYNAMIC FIX)
+    # -----------------------------
+    def business_type(d):
+        return detect_business_type(d["business_info"])
 
-        # -----------------------------
-        # 🔑 STEP 6: SEO (DYNAMIC FIX)
-        # -----------------------------
-        business_type = detect_business_type(business_info)
-        keywords = get_dynamic_keywords(business_type, business_info)
+    def seo_visibility(d):
+        info = d["business_info"]
+        keywords = get_dynamic_keywords(d["business_type"], info)
 
-        seo_visibility = get_seo_visibility(
+        return get_seo_visibility(
             website_url=website_url,
             keywords=keywords,
-            geo_hint=business_info.get("location", ""),
-            country_code="us"
+            geo_hint=info.get("location", ""),
+            country_code="us",
+            refresh=refresh
         )
 
-        # -----------------------------
-        # RAW AUDIT DATA
-        # -----------------------------
-        audit_results = {
-            "business_info": business_info,
-            "tech_stack": tech_stack,
-            "pagespeed": pagespeed,
-            "google_reviews": google_reviews,
-            "facebook_reviews": facebook_reviews,
-            "seo_visibility": seo_visibility,
-        }
-
-        # -----------------------------
-        # STEP 7: SCORING ENGINE
-        # -----------------------------
-        section_scores = map_audit_to_scores(audit_results)
-
-        score_result = calculate_marketing_score(section_scores)
-        final_score = score_result["final_score"]
-        breakdown = score_result["breakdown"]
-
-        grade = get_marketing_grade(final_score)
-
-        # -----------------------------
-        # STEP 8: REPORT SCORES
-        # -----------------------------
-        report_scores = build_report_scores(
-            audit_results=audit_results,
-            section_scores=section_scores,
-            final_score=final_score
-        )
-
-        # -----------------------------
-        # STEP 9: AI SUMMARY
-        # -----------------------------
-        ai_report = generate_ai_audit(
-            audit_results,
-            final_score,
-            grade
+    # -----------------------------
+    # STEP 7 + 8: SCORING ENGINE + REPORT SCORES
+    # -----------------------------
+    def scoring(d):
+        return _score_audit(d)
+
+    # -----------------------------
+    # STEP 9: AI SUMMARY
+    # -----------------------------
+    def ai_summary(d):
+        s = d["scoring"]
+
+        on_token = None
+        if on_event:
+            def on_token(text):
+                on_event({"stage": "ai_summary", "status": "token", "token": text})
+
+        return generate_ai_audit(
+            s["audit_results"],
+            s["final_score"],
+            s["grade"],
+            on_token=on_token
         )
 
-        # -----------------------------
-        # STEP 10: HTML REPORT
-        # -----------------------------
-        html_report_path = generate_html_report({
-            "business_info": business_info,
-            "final_score": final_score,
-            "grade": grade,
-            "report_scores": report_scores,
-            "ai_audit_report": ai_report,
-            "audit_results": audit_results
+    # -----------------------------
+    # STEP 10: HTML REPORT
+    # -----------------------------
+    def html_report(d):
+        s = d["scoring"]
+        return generate_html_report({
+            "business_info": s["audit_results"]["business_info"],
+            "final_score": s["final_score"],
+            "grade": s["grade"],
+            "report_scores": s["report_scores"],
+            "ai_audit_report": d["ai_summary"],
+            "audit_results": s["audit_results"]
         })
 
-        # -----------------------------
-        # STEP 11: EXCEL STORAGE
-        # -----------------------------
-        excel_path = store_audit_in_excel({
+    # -----------------------------
+    # STEP 11: AUDIT STORE + EXCEL EXPORT (RUNS WHILE THE AI SUMMARY IS GENERATED)
+    # -----------------------------
+    def store(d):
+        s = d["scoring"]
+        return store_audit({
             "website": website_url,
-            "business_type": business_type,
-            "final_score": final_score,
-            "grade": grade,
-            "report_scores": report_scores
+            "business_type": d["business_type"],
+            "final_score": s["final_score"],
+            "grade": s["grade"],
+            "report_scores": s["report_scores"],
+            "collectors": s["audit_results"],
         })
 
+    def excel(d):
+        return export_audit_to_excel(d["store"]) if export_excel else None
+
+    collectors = (
+        "business_info", "tech_stack", "pagespeed",
+        "google_reviews", "facebook_reviews", "seo_visibility",
+    )
+
+    return [
+        Stage("business_info", business_info),
+        Stage("tech_stack", tech_stack),
+        Stage("pagespeed", pagespeed),
+        Stage("google_reviews", google_reviews, deps=("business_info",)),
+        Stage("facebook_url", facebook_url),
+        Stage("facebook_reviews", facebook_reviews, deps=("facebook_url",)),
+        Stage("business_type", business_type, deps=("business_info",)),
+        Stage("seo_visibility", seo_visibility, deps=("business_info", "business_type")),
+        Stage("scoring", scoring, deps=collectors),
+        Stage("ai_summary", ai_summary, deps=("scoring",)),
+        Stage("html_report", html_report, deps=("scoring", "ai_summary")),
+        Stage("store", store, deps=("scoring", "business_type")),
+        Stage("excel", excel, deps=("store",)),
+    ]
+
+
+# ============================================================
+# CORE FUNCTION (UI SAFE)
+# ============================================================
+
+def run_marketing_audit(
+    website_url: str,
+    export_excel: bool = True,
+    on_event=None,
+    refresh: bool = False,
+) -> dict:
+    """
+    Runs the full audit. `on_event(event)` receives per-stage progress
+    (started / finished with duration and partial result / failed) and the
+    streamed AI summary tokens; it is called from worker threads.
+    refresh=True bypasses the collector caches.
+    """
+    try:
+        results = run_pipeline(
+            build_audit_stages(website_url, export_excel, on_event, refresh),
+            on_event=on_event,
+        )
+        scoring = results["scoring"]
+
         # -----------------------------
         # UI RESPONSE
         # -----------------------------
         return {
             "status": "success",
             "website": website_url,
-            "business_type": business_type,
+            "business_type": results["business_type"],
 
-            "collectors": audit_results,
+            "collectors": scoring["audit_results"],
 
-            "final_score": final_score,
-            "grade": grade,
-            "engine_breakdown": breakdown,
-            "report_scores": report_scores,
+            "final_score": scoring["final_score"],
+            "grade": scoring["grade"],
+            "engine_breakdown": scoring["breakdown"],
+            "report_scores": scoring["report_scores"],
 
-            "ai_summary": ai_report,
+            "ai_summary": results["ai_summary"],
 
-            "html_report_path": html_report_path,
-            "excel_path": excel_path
+            "html_report_path": results["html_report"],
+            "excel_path": results["excel"],
+            "audit_id": results["store"]
         }
 
     except Exception as e:
@@ -38,14 +38,18 @@ class AuditMetrics(BaseModel):
     google_reviews_positive: Optional[int] = None
     google_reviews_negative: Optional[int] = None
     google_reply_rate: Optional[float] = None
-    google_avg_response_time: Optional[float] = None
+    google_avg_response_time: Optional[float] = None  # hours
+    google_median_response_time: Optional[float] = None
+    google_rating_trend: Optional[Dict[str, Optional[float]]] = None
 
     #FACEBOOK REVIEWS
     facebook_reviews_total: Optional[int] = None
     facebook_reviews_positive: Optional[int] = None
     facebook_reviews_negative: Optional[int] = None
     facebook_reply_rate: Optional[float] = None
-    facebook_avg_response_time: Optional[float] = None
+    facebook_avg_response_time: Optional[float] = None  # hours
+    facebook_median_response_time: Optional[float] = None
+    facebook_rating_trend: Optional[Dict[str, Optional[float]]] = None
     facebook_reviews_unknown: Optional[int] = None
 
 
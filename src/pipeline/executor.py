@@ -0,0 +1,112 @@
+# pipeline/executor.py
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+class Stage:
+    """
+    One step of the audit pipeline.
+    `fn` receives the results of the stages it depends on, keyed by stage name.
+    """
+
+    def __init__(self, name: str, fn, deps: tuple = ()):
+        self.name = name
+        self.fn = fn
+        self.deps = tuple(deps)
+
+
+def _check_graph(stages: list[Stage]):
+    names = {s.name for s in stages}
+    if len(names) != len(stages):
+        raise ValueError("Duplicate stage names in pipeline")
+
+    for stage in stages:
+        missing = [d for d in stage.deps if d not in names]
+        if missing:
+            raise ValueError(f"Stage '{stage.name}' depends on unknown stages: {missing}")
+
+
+def _emit(on_event, event: dict):
+    if on_event is None:
+        return
+    try:
+        on_event(event)
+    except Exception as e:
+        # a broken listener must never break the audit
+        print("Pipeline event handler error:", e, file=sys.stderr)
+
+
+def _run_stage(stage: Stage, inputs: dict, on_event):
+    _emit(on_event, {"stage": stage.name, "status": "started"})
+    started = time.perf_counter()
+
+    try:
+        result = stage.fn(inputs)
+    except Exception as e:
+        _emit(on_event, {
+            "stage": stage.name,
+            "status": "failed",
+            "duration": round(time.perf_counter() - started, 3),
+            "error": str(e),
+        })
+        raise
+
+    _emit(on_event, {
+        "stage": stage.name,
+        "status": "finished",
+        "duration": round(time.perf_counter() - started, 3),
+        "result": result,
+    })
+    return result
+
+
+def run_pipeline(stages: list[Stage], max_workers: int = 8, on_event=None) -> dict:
+    """
+    Runs every stage as soon as all of its dependencies have finished.
+    Independent stages run at the same time, so wall-clock time follows the
+    critical path instead of the sum of all stages.
+
+    `on_event(event)` is called from the worker threads with
+    {"stage", "status": "started" | "finished" | "failed"} plus "duration"
+    and the stage "result" (or "error").
+
+    Returns {stage_name: result}. The first stage error is re-raised right
+    away; stages still running are left to finish in the background.
+    """
+    _check_graph(stages)
+
+    results = {}
+    pending = list(stages)
+    running = {}
+
+    # not a `with` block: on a failure the error must come out at once,
+    # not after the slowest stage still running
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        while pending or running:
+            # submit every stage whose dependencies are done
+            ready = [s for s in pending if all(d in results for d in s.deps)]
+            for stage in ready:
+                pending.remove(stage)
+                inputs = {d: results[d] for d in stage.deps}
+                running[pool.submit(_run_stage, stage, inputs, on_event)] = stage
+
+            if not running:
+                raise ValueError(
+                    "Pipeline has a dependency cycle: "
+                    + ", ".join(s.name for s in pending)
+                )
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                stage = running.pop(future)
+                error = future.exception()
+                if error is not None:
+                    raise error
+                results[stage.name] = future.result()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    return results
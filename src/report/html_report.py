@@ -1,97 +1,148 @@
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from string import Template
+import gzip
+import html
+import json
 import os
+import re
 
-def generate_html_report(result: dict, output_dir="reports"):
-    os.makedirs(output_dir, exist_ok=True)
+STYLESHEET_NAME = "report.css"
+
+REPORT_CSS = (
+    "body{font-family:Arial;background:#0f172a;color:white;padding:40px}"
+    "table{width:100%;border-collapse:collapse;margin-top:20px}"
+    "th,td{border:1px solid #334155;padding:12px;text-align:left}"
+    "th{background:#1e293b}"
+    ".score{font-size:40px;color:#38bdf8}"
+    ".section{margin-top:40px}"
+    "pre{white-space:pre-wrap}"
+)
+
+# Compiled once at import; every report only substitutes values.
+_HEAD = Template(
+    "<!DOCTYPE html><html><head><meta charset=\"utf-8\">"
+    "<title>Marketing Audit - $name</title>$styles</head><body>"
+    "<h1>Marketing Audit – $name</h1><p>Date: $date</p>"
+    "<div class=\"score\">Overall Score: $final_score / 100</div>"
+    "<div class=\"section\"><h2>Category Scores</h2><table>"
+    "<tr><th>Category</th><th>Score</th></tr>"
+)
+
+_ROW = Template("<tr><td>$category</td><td>$score%</td></tr>")
+
+_TAIL = Template(
+    "</table></div>"
+    "<div class=\"section\"><h2>AI Observations</h2><pre>$ai</pre></div>"
+    "<div class=\"section\"><h2>Raw Audit Data (Collector Outputs)</h2><pre id=\"raw\"></pre></div>"
+    "<script type=\"application/json\" id=\"audit-data\">$data</script>"
+    "<script>document.getElementById('raw').textContent="
+    "JSON.stringify(JSON.parse(document.getElementById('audit-data').textContent),null,2)</script>"
+    "</body></html>"
+)
+
+
+def _safe_name(name: str) -> str:
+    return re.sub(r'[\\/:*?"<>|]', "", name).strip() or "Business"
+
+
+def _site_slug(url: str) -> str:
+    host = re.sub(r"^[a-z]+://", "", (url or "").strip().lower()).split("/")[0]
+    host = host[4:] if host.startswith("www.") else host
+    return re.sub(r"[^a-z0-9.-]+", "-", host).strip("-.")
+
+
+def _json_for_script(data) -> str:
+    # compact JSON that cannot close the surrounding <script> tag or open
+    # an HTML comment inside it: every "<" becomes \u003c (still valid JSON)
+    text = json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=str)
+    return text.replace("<", "\\u003c")
+
+
+def _render_chunks(result: dict, business_name: str, date_str: str, stylesheet_href: str | None):
+    if stylesheet_href:
+        styles = f'<link rel="stylesheet" href="{html.escape(stylesheet_href)}">'
+    else:
+        styles = f"<style>{REPORT_CSS}</style>"
+
+    yield _HEAD.substitute(
+        name=html.escape(business_name),
+        styles=styles,
+        date=date_str,
+        final_score=html.escape(str(result["final_score"])),
+    )
+
+    for category, score in result["report_scores"].items():
+        yield _ROW.substitute(
+            category=html.escape(str(category)),
+            score=html.escape(str(score)),
+        )
 
-    business_name = result.get("business_info", {}).get(
-        "business_name", "Business"
+    yield _TAIL.substitute(
+        ai=html.escape(str(result["ai_audit_report"] or "")),
+        data=_json_for_script(result["audit_results"]),
     )
 
 
+def _write_report(
+    result: dict,
+    output_dir: str,
+    stylesheet_href: str | None,
+    gzip_output: bool,
+    unique: str = "",
+) -> str:
+    business_name = (result.get("business_info") or {}).get("business_name") or "Business"
 
     date_str = datetime.now().strftime("%Y-%m-%d")
-    filename = f"Marketing Audit - {business_name} - {date_str}.html"
+    suffix = f" - {unique}" if unique else ""
+    filename = f"Marketing Audit - {_safe_name(business_name)} - {date_str}{suffix}.html"
     filepath = os.path.join(output_dir, filename)
 
-    rows = ""
-    for category, score in result["report_scores"].items():
-        rows += f"""
-        <tr>
-            <td>{category}</td>
-            <td>{score}%</td>
-        </tr>
-        """
-
-    html = f"""
-    <html>
-    <head>
-        <title>Marketing Audit - {business_name}</title>
-        <style>
-            body {{
-                font-family: Arial;
-                background: #0f172a;
-                color: white;
-                padding: 40px;
-            }}
-            table {{
-                width: 100%;
-                border-collapse: collapse;
-                margin-top: 20px;
-            }}
-            th, td {{
-                border: 1px solid #334155;
-                padding: 12px;
-                text-align: left;
-            }}
-            th {{
-                background: #1e293b;
-            }}
-            .score {{
-                font-size: 40px;
-                color: #38bdf8;
-            }}
-            .section {{
-                margin-top: 40px;
-            }}
-        </style>
-    </head>
-    <body>
-
-        <h1>Marketing Audit – {business_name}</h1>
-        <p>Date: {date_str}</p>
-
-        <div class="score">
-            Overall Score: {result["final_score"]} / 100
-        </div>
-
-        <div class="section">
-            <h2>Category Scores</h2>
-            <table>
-                <tr>
-                    <th>Category</th>
-                    <th>Score</th>
-                </tr>
-                {rows}
-            </table>
-        </div>
-
-        <div class="section">
-            <h2>AI Observations</h2>
-            <pre>{result["ai_audit_report"]}</pre>
-        </div>
-        
-        <div class="section">
-            <h2>Raw Audit Data (Collector Outputs)</h2>
-            <pre>{result["audit_results"]}</pre>
-        </div>
-
-
-    </body>
-    </html>
-    """
+    if gzip_output:
+        filepath += ".gz"
+        f = gzip.open(filepath, "wt", encoding="utf-8")
+    else:
+        f = open(filepath, "w", encoding="utf-8")
 
-    with open(filepath, "w", encoding="utf-8") as f:
-        f.write(html)
+    with f:
+        for chunk in _render_chunks(result, business_name, date_str, stylesheet_href):
+            f.write(chunk)
 
     return filepath
+
+
+def generate_html_report(result: dict, output_dir="reports", gzip_output: bool = False):
+    """
+    Writes one self-contained report (stylesheet inlined) and returns its path.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    return _write_report(result, output_dir, None, gzip_output)
+
+
+def generate_html_reports(
+    results: list[dict],
+    output_dir="reports",
+    workers: int = 8,
+    gzip_output: bool = False,
+) -> list[str]:
+    """
+    Bulk mode: renders many reports in parallel. All reports link one
+    shared stylesheet written once to `output_dir`, instead of inlining it.
+    File names carry the site (`website` key, when present) and the input
+    position, so reports for unnamed or same-named businesses don't collide.
+    Returns the report paths in input order.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    with open(os.path.join(output_dir, STYLESHEET_NAME), "w", encoding="utf-8") as f:
+        f.write(REPORT_CSS)
+
+    def unique(i: int, result: dict) -> str:
+        slug = _site_slug(result.get("website") or "")
+        return f"{slug} - {i + 1:04d}" if slug else f"{i + 1:04d}"
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(
+            lambda ir: _write_report(ir[1], output_dir, STYLESHEET_NAME, gzip_output, unique(*ir)),
+            enumerate(results),
+        ))
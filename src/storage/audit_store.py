@@ -0,0 +1,224 @@
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from urllib.parse import urlparse
+
+AUDIT_DB_PATH = os.getenv("AUDIT_DB_PATH", os.path.join("data", "audits.sqlite"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS audits (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    website TEXT NOT NULL,
+    domain TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    business_type TEXT,
+    final_score REAL,
+    grade TEXT,
+    risk_level TEXT,
+    verdict TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_audits_domain ON audits (domain, created_at);
+CREATE INDEX IF NOT EXISTS idx_audits_created ON audits (created_at);
+
+CREATE TABLE IF NOT EXISTS section_scores (
+    audit_id INTEGER NOT NULL REFERENCES audits (id) ON DELETE CASCADE,
+    section TEXT NOT NULL,
+    score REAL,
+    PRIMARY KEY (audit_id, section)
+);
+
+CREATE TABLE IF NOT EXISTS collector_outputs (
+    audit_id INTEGER NOT NULL REFERENCES audits (id) ON DELETE CASCADE,
+    collector TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (audit_id, collector)
+);
+"""
+
+
+def _domain(website: str) -> str:
+    u = website if "://" in website else "https://" + website
+    return urlparse(u).netloc.replace("www.", "").lower()
+
+
+class AuditStore:
+    """
+    Embedded audit history (SQLite, WAL mode).
+
+    audits            one row per audit, indexed by domain and date
+    section_scores    report score per category
+    collector_outputs raw collector JSON per audit
+
+    Each save is a single transaction; save_audits() writes many at once.
+    Connections are per thread, so the store can be shared by pipeline
+    stages and batch workers.
+    """
+
+    def __init__(self, path: str = AUDIT_DB_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self._local = threading.local()
+
+        conn = self._conn()
+        conn.executescript(SCHEMA)
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    # --------------------------------------------------
+    # WRITES
+    # --------------------------------------------------
+    def _insert(self, conn: sqlite3.Connection, audit: dict) -> int:
+        website = audit.get("website", "")
+        grade = audit.get("grade") or {}
+
+        cur = conn.execute(
+            """
+            INSERT INTO audits
+                (website, domain, created_at, business_type, final_score, grade, risk_level, verdict)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                website,
+                _domain(website),
+                audit.get("created_at") or datetime.now().isoformat(timespec="seconds"),
+                audit.get("business_type"),
+                audit.get("final_score"),
+                grade.get("grade"),
+                grade.get("risk_level"),
+                grade.get("verdict"),
+            ),
+        )
+        audit_id = cur.lastrowid
+
+        conn.executemany(
+            "INSERT INTO section_scores (audit_id, section, score) VALUES (?, ?, ?)",
+            [(audit_id, k, v) for k, v in (audit.get("report_scores") or {}).items()],
+        )
+        conn.executemany(
+            "INSERT INTO collector_outputs (audit_id, collector, payload) VALUES (?, ?, ?)",
+            [
+                (audit_id, k, json.dumps(v, separators=(",", ":"), default=str))
+                for k, v in (audit.get("collectors") or {}).items()
+            ],
+        )
+        return audit_id
+
+    def save_audit(self, audit: dict) -> int:
+        """
+        Stores one audit. Expects website, business_type, final_score,
+        grade, report_scores and optionally collectors / created_at.
+        """
+        conn = self._conn()
+        with conn:
+            return self._insert(conn, audit)
+
+    def save_audits(self, audits: list[dict]) -> list[int]:
+        conn = self._conn()
+        with conn:
+            return [self._insert(conn, a) for a in audits]
+
+    # --------------------------------------------------
+    # READS
+    # --------------------------------------------------
+    def get_audit(self, audit_id: int) -> dict | None:
+        conn = self._conn()
+        row = conn.execute("SELECT * FROM audits WHERE id = ?", (audit_id,)).fetchone()
+        if row is None:
+            return None
+
+        audit = dict(row)
+        audit["report_scores"] = {
+            r["section"]: r["score"]
+            for r in conn.execute(
+                "SELECT section, score FROM section_scores WHERE audit_id = ?", (audit_id,)
+            )
+        }
+        audit["collectors"] = {
+            r["collector"]: json.loads(r["payload"])
+            for r in conn.execute(
+                "SELECT collector, payload FROM collector_outputs WHERE audit_id = ?", (audit_id,)
+            )
+        }
+        return audit
+
+    def find_audits(
+        self,
+        domain: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        limit: int | None = 100,
+    ) -> list[dict]:
+        """
+        Audit rows (newest first) filtered by domain and/or ISO date range.
+        """
+        where, params = [], []
+        if domain:
+            where.append("domain = ?")
+            params.append(_domain(domain))
+        if since:
+            where.append("created_at >= ?")
+            params.append(since)
+        if until:
+            where.append("created_at < ?")
+            params.append(until)
+
+        sql = "SELECT * FROM audits"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY created_at DESC, id DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        return [dict(r) for r in self._conn().execute(sql, params)]
+
+    def export_rows(self, audit_ids: list[int]) -> list[dict]:
+        """
+        Flat rows (website, score, grade, one column per section) for export.
+        """
+        if not audit_ids:
+            return []
+
+        conn = self._conn()
+        marks = ",".join("?" * len(audit_ids))
+
+        rows = {
+            r["id"]: {
+                "Website": r["website"],
+                "Final Score": r["final_score"],
+                "Grade": r["grade"],
+            }
+            for r in conn.execute(
+                f"SELECT id, website, final_score, grade FROM audits WHERE id IN ({marks})", audit_ids
+            )
+        }
+        for r in conn.execute(
+            f"SELECT audit_id, section, score FROM section_scores WHERE audit_id IN ({marks})", audit_ids
+        ):
+            rows[r["audit_id"]][r["section"]] = r["score"]
+
+        return [rows[i] for i in audit_ids if i in rows]
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_audit_store() -> AuditStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = AuditStore()
+    return _store
@@ -1,38 +1,54 @@
-import pandas as pd
 import os
 from datetime import datetime
 import re
 
+from storage.audit_store import get_audit_store
+
 
 def safe_filename(text: str):
     text = re.sub(r"[^\w\s-]", "", text)
     return text.replace(" ", "_").lower()
 
 
-def store_audit_in_excel(audit_data: dict, output_dir="data"):
-    os.makedirs(output_dir, exist_ok=True)
+def export_audits_to_excel(audit_ids: list[int], filepath: str) -> str:
+    """
+    On-demand Excel export of stored audits (one row per audit).
+    """
+    import pandas as pd
 
-    website = audit_data.get("website", "website")
-    safe_site = safe_filename(website.replace("https://", "").replace("http://", ""))
+    os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
 
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    df = pd.DataFrame(get_audit_store().export_rows(audit_ids))
 
-    filename = f"audit_{safe_site}_{timestamp}.xlsx"
-    filepath = os.path.join(output_dir, filename)
+    # SAFE WRITE
+    df.to_excel(filepath, index=False)
 
-    # Flatten for Excel
-    row = {
-        "Website": website,
-        "Final Score": audit_data.get("final_score"),
-        "Grade": audit_data.get("grade", {}).get("grade"),
-    }
+    return filepath
 
-    for k, v in audit_data.get("report_scores", {}).items():
-        row[k] = v
 
-    df = pd.DataFrame([row])
+def export_audit_to_excel(audit_id: int, output_dir="data") -> str:
+    audit = get_audit_store().get_audit(audit_id)
+    if audit is None:
+        raise ValueError(f"Audit {audit_id} not found")
 
-    # SAFE WRITE
-    df.to_excel(filepath, index=False)
+    safe_site = safe_filename(audit["website"].replace("https://", "").replace("http://", ""))
+    timestamp = datetime.fromisoformat(audit["created_at"]).strftime("%Y%m%d_%H%M%S")
 
-    return filepath
+    filename = f"audit_{safe_site}_{timestamp}.xlsx"
+    return export_audits_to_excel([audit_id], os.path.join(output_dir, filename))
+
+
+def store_audit(audit_data: dict) -> int:
+    """
+    Persists an audit in the indexed store and returns its id.
+    """
+    return get_audit_store().save_audit(audit_data)
+
+
+def store_audit_in_excel(audit_data: dict, output_dir="data"):
+    """
+    Stores the audit and exports it as a single-row .xlsx (legacy behaviour).
+    Prefer store_audit() + export_audits_to_excel() for bulk runs.
+    """
+    audit_id = store_audit(audit_data)
+    return export_audit_to_excel(audit_id, output_dir)
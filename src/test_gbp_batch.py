@@ -0,0 +1,19 @@
+from collectors.gbp_reviews import fetch_gbp_batch
+
+jobs = [
+    {
+        "search_term": "American Horizon Property Management",
+        "location": "Roseville, CA",
+        "target_website": "https://www.americanhorizonproperty.com/",
+    },
+    {
+        "search_term": "Odoo",
+        "location": "San Francisco, CA",
+        "target_website": "https://www.odoo.com/",
+    },
+]
+
+for job, data in zip(jobs, fetch_gbp_batch(jobs)):
+    print("==", job["search_term"])
+    for k, v in data.items():
+        print(f"{k}: {v}")
@@ -0,0 +1,20 @@
+from collectors.seo_visibility import get_seo_visibility_batch
+
+jobs = [
+    {
+        "website_url": "https://www.americanhorizonproperty.com/",
+        "keywords": ["property management", "homes for rent"],
+        "geo_hint": "Roseville CA",
+        "country_code": "us",
+    },
+    {
+        "website_url": "https://www.odoo.com/",
+        "keywords": ["erp software", "open source crm"],
+        "country_code": "us",
+    },
+]
+
+for job, data in zip(jobs, get_seo_visibility_batch(jobs)):
+    print(job["website_url"], "visibility_score:", data["visibility_score"])
+    for k, v in data["keyword_rankings"].items():
+        print(" -", k, "=>", v)
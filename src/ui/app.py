@@ -2,6 +2,10 @@ import streamlit as st
 import pandas as pd
 import os
 import sys
+import queue
+import threading
+import time
+from collections import OrderedDict
 
 # --------------------------------------------------
 # Fix import path (CRITICAL – no more src errors)
@@ -10,6 +14,70 @@ ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 sys.path.append(ROOT_DIR)
 
 from main import run_marketing_audit
+from scoring.score_mapper import map_audit_to_scores
+from scoring.scoring_engine import calculate_marketing_score
+from utils.urls import normalize_url
+
+COLLECTOR_SECTIONS = [
+    "business_info",
+    "tech_stack",
+    "pagespeed",
+    "google_reviews",
+    "facebook_reviews",
+    "seo_visibility",
+]
+
+# Finished audits are reused for this long (seconds) across reruns and sessions
+UI_RESULT_TTL = int(os.getenv("UI_RESULT_TTL", "3600"))
+RECENT_LIMIT = 10
+
+
+# --------------------------------------------------
+# Result cache (process-wide, shared by all sessions)
+# --------------------------------------------------
+class ResultCache:
+    """
+    Finished audit results keyed by normalized URL, with a TTL and a size cap.
+    """
+
+    def __init__(self, ttl: int, max_items: int = 200):
+        self.ttl = ttl
+        self.max_items = max_items
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            saved_at, result = item
+            if time.time() - saved_at > self.ttl:
+                del self._items[key]
+                return None
+            return result
+
+    def put(self, key: str, result: dict):
+        with self._lock:
+            self._items.pop(key, None)
+            self._items[key] = (time.time(), result)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+    def recent(self, limit: int) -> list:
+        now = time.time()
+        with self._lock:
+            items = [
+                (key, saved_at, result)
+                for key, (saved_at, result) in reversed(self._items.items())
+                if now - saved_at <= self.ttl
+            ]
+        return items[:limit]
+
+
+@st.cache_resource
+def get_result_cache() -> ResultCache:
+    return ResultCache(UI_RESULT_TTL)
 
 
 # --------------------------------------------------
@@ -34,27 +102,106 @@ including **SEO, Reviews, Tech Stack, Scoring Engine & AI Insights**
 
 st.divider()
 
+
 # --------------------------------------------------
-# URL Input
+# Rendering helpers
 # --------------------------------------------------
-website_url = st.text_input(
-    "🌐 Enter Website URL",
-    placeholder="https://www.example.com"
-)
+def section_title(section: str) -> str:
+    return section.replace("_", " ").title()
 
-run_btn = st.button("🔍 Run Marketing Audit")
 
-# --------------------------------------------------
-# Run Audit
-# --------------------------------------------------
-if run_btn and website_url:
-    with st.spinner("Running audit... this may take 1–2 minutes"):
-        result = run_marketing_audit(website_url)
+def render_collector(section: str, data):
+    with st.expander(section_title(section), expanded=False):
+        if isinstance(data, dict):
+            df = pd.DataFrame(
+                data.items(),
+                columns=["Metric", "Value"]
+            )
+            st.dataframe(df, use_container_width=True)
+        else:
+            st.write(data)
 
-    if result["status"] != "success":
-        st.error(f"❌ Audit failed: {result.get('error')}")
-        st.stop()
 
+def run_audit_with_progress(website_url: str, refresh: bool = False) -> dict:
+    """
+    Runs the audit in a background thread and draws each collector,
+    the running score and the streamed AI summary as soon as they arrive.
+    Streamlit calls stay on the script thread; the pipeline only pushes
+    events into a queue.
+    """
+    events = queue.Queue()
+    holder = {}
+
+    def worker():
+        holder["result"] = run_marketing_audit(website_url, on_event=events.put, refresh=refresh)
+        events.put(None)
+
+    threading.Thread(target=worker, daemon=True).start()
+
+    live = st.empty()
+    with live.container():
+        st.subheader("⏳ Audit in progress")
+        status_box = st.empty()
+        score_box = st.empty()
+        st.subheader("🔍 Collector Outputs")
+        collector_boxes = {s: st.empty() for s in COLLECTOR_SECTIONS}
+        st.subheader("🧠 AI Marketing Summary")
+        ai_box = st.empty()
+
+    for s in COLLECTOR_SECTIONS:
+        collector_boxes[s].info(f"⏳ {section_title(s)} …")
+
+    stage_status = {}
+    partial = {}
+    ai_text = ""
+
+    while True:
+        ev = events.get()
+        if ev is None:
+            break
+
+        stage, status = ev["stage"], ev["status"]
+
+        if status == "token":
+            ai_text += ev["token"]
+            ai_box.markdown(ai_text + " ▌")
+            continue
+
+        if status == "started":
+            stage_status[stage] = "⏳"
+        elif status == "finished":
+            stage_status[stage] = f"✅ {ev['duration']:.1f}s"
+        else:
+            stage_status[stage] = "❌"
+
+        status_box.markdown(" · ".join(f"**{k}** {v}" for k, v in stage_status.items()))
+
+        if status != "finished":
+            continue
+
+        if stage in COLLECTOR_SECTIONS:
+            partial[stage] = ev["result"]
+            with collector_boxes[stage].container():
+                render_collector(stage, ev["result"])
+
+            # running score from the collectors that have arrived so far
+            running = calculate_marketing_score(map_audit_to_scores(partial))["final_score"]
+            score_box.metric(
+                f"Running score ({len(partial)}/{len(COLLECTOR_SECTIONS)} collectors)",
+                f"{running} / 100"
+            )
+
+        elif stage == "scoring":
+            score_box.metric("Score", f"{ev['result']['final_score']} / 100")
+
+        elif stage == "ai_summary":
+            ai_box.markdown(ev["result"])
+
+    live.empty()
+    return holder["result"]
+
+
+def render_result(result: dict):
     st.success("✅ Audit completed successfully!")
 
     # ==================================================
@@ -99,18 +246,8 @@ if run_btn and website_url:
     # ==================================================
     st.subheader("🔍 Collector Outputs (Technical Proof)")
 
-    collectors = result["collectors"]
-
-    for section, data in collectors.items():
-        with st.expander(section.replace("_", " ").title(), expanded=False):
-            if isinstance(data, dict):
-                df = pd.DataFrame(
-                    data.items(),
-                    columns=["Metric", "Value"]
-                )
-                st.dataframe(df, use_container_width=True)
-            else:
-                st.write(data)
+    for section, data in result["collectors"].items():
+        render_collector(section, data)
 
     st.divider()
 
@@ -145,6 +282,63 @@ if run_btn and website_url:
 
     st.success("🎉 Marketing Audit Completed Successfully!")
 
+
+# --------------------------------------------------
+# URL Input
+# --------------------------------------------------
+website_url = st.text_input(
+    "🌐 Enter Website URL",
+    placeholder="https://www.example.com"
+)
+
+force_refresh = st.checkbox("🔄 Force refresh (ignore cached results)")
+
+run_btn = st.button("🔍 Run Marketing Audit")
+
+result_cache = get_result_cache()
+
+# --------------------------------------------------
+# Recent Audits (instant re-render, no new audit)
+# --------------------------------------------------
+with st.sidebar:
+    st.subheader("🕘 Recent Audits")
+
+    recent = result_cache.recent(RECENT_LIMIT)
+    if not recent:
+        st.caption("No audits yet")
+
+    for key, saved_at, cached in recent:
+        age_min = int((time.time() - saved_at) / 60)
+        label = f"{cached['website']} · {cached['final_score']}/100 · {age_min} min ago"
+        if st.button(label, key=f"recent_{key}"):
+            st.session_state["audit_result"] = cached
+
+# --------------------------------------------------
+# Run Audit
+# --------------------------------------------------
+if run_btn and website_url:
+    cache_key = normalize_url(website_url)
+    result = None if force_refresh else result_cache.get(cache_key)
+
+    if result is None:
+        result = run_audit_with_progress(website_url, refresh=force_refresh)
+
+        if result["status"] != "success":
+            st.error(f"❌ Audit failed: {result.get('error')}")
+            st.stop()
+
+        result_cache.put(cache_key, result)
+    else:
+        st.info("⚡ Showing a recent result for this URL. Tick *Force refresh* to run a new audit.")
+
+    st.session_state["audit_result"] = result
+
+# --------------------------------------------------
+# Show Result (survives reruns from expanders / download buttons)
+# --------------------------------------------------
+if st.session_state.get("audit_result"):
+    render_result(st.session_state["audit_result"])
+
 # --------------------------------------------------
 # Footer
 # --------------------------------------------------
@@ -0,0 +1,26 @@
+import os
+import threading
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+_client = None
+_lock = threading.Lock()
+
+
+def get_apify_client():
+    """
+    Shared ApifyClient, created on first use.
+    apify_client is imported here (not at module import) to keep startup fast.
+    """
+    global _client
+    with _lock:
+        if _client is None:
+            token = os.getenv("APIFY_API_TOKEN")
+            if not token:
+                raise RuntimeError("APIFY_API_TOKEN missing in .env")
+
+            from apify_client import ApifyClient
+            _client = ApifyClient(token)
+    return _client
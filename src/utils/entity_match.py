@@ -0,0 +1,132 @@
+# utils/entity_match.py
+import math
+import re
+import unicodedata
+
+# Dropped from names before matching ("Acme Plumbing LLC" == "Acme Plumbing")
+LEGAL_SUFFIXES = {
+    "llc", "inc", "incorporated", "ltd", "limited", "co", "corp", "corporation",
+    "company", "pllc", "llp", "lp", "plc", "pc", "gmbh",
+}
+STOPWORDS = {"the", "and", "of", "a", "an"}
+
+# <title> segments that are not part of the business name ("Acme | Home")
+GENERIC_SEGMENTS = {
+    "home", "homepage", "home page", "welcome", "official site", "official website",
+    "contact", "contact us", "about", "about us", "services", "index",
+}
+
+TITLE_SEPARATORS = re.compile(r"\s+[|–—:·•»]\s+|\s+-\s+|\s*\|\s*")
+NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def _ascii(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text)
+    return text.encode("ascii", "ignore").decode("ascii")
+
+
+def _stem(token: str) -> str:
+    # plumbers -> plumber, services -> service (not "glass", "bus")
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def name_tokens(text: str) -> frozenset:
+    """
+    Normalized token set of one name: lowercase ASCII, '&' -> and,
+    apostrophes joined (joe's -> joes), legal suffixes/stopwords dropped.
+    """
+    text = _ascii(text or "").lower().replace("&", " and ").replace("'", "").replace("’", "")
+    tokens = (_stem(t) for t in NON_WORD.split(text) if t)
+    return frozenset(t for t in tokens if t not in LEGAL_SUFFIXES and t not in STOPWORDS)
+
+
+def name_signature(name: str) -> tuple:
+    """
+    Token sets to compare a name by: the whole name without generic title
+    segments, plus each remaining segment on its own
+    ("Acme Plumbing | Best Plumber in Austin" also matches "Acme Plumbing").
+    """
+    segments = [s.strip() for s in TITLE_SEPARATORS.split(name or "") if s.strip()]
+    kept = [s for s in segments if s.lower() not in GENERIC_SEGMENTS] or segments
+
+    variants = [name_tokens(" ".join(kept))]
+    if len(kept) > 1:
+        variants.extend(name_tokens(s) for s in kept)
+
+    return tuple(v for v in dict.fromkeys(variants) if v)
+
+
+def _weighted_dice(a: frozenset, b: frozenset, weight) -> float:
+    common = sum(weight(t) for t in a & b)
+    if not common:
+        return 0.0
+    return 2 * common / (sum(weight(t) for t in a) + sum(weight(t) for t in b))
+
+
+def _best(sig_a: tuple, sig_b: tuple, weight) -> float:
+    return max((_weighted_dice(a, b, weight) for a in sig_a for b in sig_b), default=0.0)
+
+
+def name_similarity(a: str, b: str) -> float:
+    """
+    0..1 similarity of two business names (unweighted tokens).
+    """
+    return _best(name_signature(a), name_signature(b), lambda t: 1.0)
+
+
+class EntityIndex:
+    """
+    Candidate names (e.g. GBP place titles) with precomputed signatures,
+    IDF token weights and an inverted index, so a query is only scored
+    against candidates that share a (not too common) token with it.
+    """
+
+    def __init__(self, names: list[str]):
+        self.names = list(names)
+        self.signatures = [name_signature(n) for n in self.names]
+        self.postings = {}
+
+        for i, sig in enumerate(self.signatures):
+            for token in set().union(*sig) if sig else ():
+                self.postings.setdefault(token, []).append(i)
+
+        n = len(self.names)
+        # tokens in more candidates than this don't generate candidates on
+        # their own (they still count in the score)
+        self.max_postings = max(50, n // 10)
+        # rare tokens ("acme") count more than common ones ("plumbing")
+        self.idf = {t: math.log(1 + n / len(ids)) for t, ids in self.postings.items()}
+        self.default_idf = math.log(1 + n) if n else 1.0
+
+    def weight(self, token: str) -> float:
+        return self.idf.get(token, self.default_idf)
+
+    def similarity(self, query, i: int) -> float:
+        """
+        Score of candidate `i` for a query name or a precomputed signature.
+        """
+        sig = name_signature(query) if isinstance(query, str) else query
+        return _best(sig, self.signatures[i], self.weight)
+
+    def search(self, query: str, top_k: int = 1, min_score: float = 0.0) -> list[tuple[int, float]]:
+        """
+        Best candidates as [(index, score)], highest first.
+        """
+        sig = name_signature(query)
+        tokens = set().union(*sig) if sig else set()
+
+        rare = [t for t in tokens if 0 < len(self.postings.get(t, ())) <= self.max_postings]
+
+        ids = set()
+        for token in rare or tokens:
+            ids.update(self.postings.get(token, ()))
+
+        scored = [(i, self.similarity(sig, i)) for i in ids]
+        scored = [x for x in scored if x[1] >= min_score and x[1] > 0]
+        scored.sort(key=lambda x: (-x[1], x[0]))
+        return scored[:top_k]
+
+    def search_many(self, queries: list[str], top_k: int = 1, min_score: float = 0.0) -> list[list[tuple[int, float]]]:
+        return [self.search(q, top_k, min_score) for q in queries]
@@ -0,0 +1,88 @@
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+UA = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+USER_AGENT = os.getenv("AUDIT_USER_AGENT", UA)
+
+HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+# Keep-alive connections kept per host, and how many hosts keep a pool
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "10"))
+HTTP_POOL_HOSTS = int(os.getenv("HTTP_POOL_HOSTS", "100"))
+
+# Retries on connection errors and 429/5xx, with exponential backoff
+# (HTTP_BACKOFF * 2^n seconds between attempts; Retry-After is honoured
+# up to HTTP_RETRY_AFTER_MAX seconds, so a 429 can't stall an audit)
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "2"))
+HTTP_BACKOFF = float(os.getenv("HTTP_BACKOFF", "0.5"))
+HTTP_RETRY_AFTER_MAX = float(os.getenv("HTTP_RETRY_AFTER_MAX", "5"))
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_session = None
+_lock = threading.Lock()
+
+
+class CappedRetry(Retry):
+    """
+    Retry whose Retry-After wait is capped at HTTP_RETRY_AFTER_MAX
+    (urllib3 otherwise waits as long as the server asks, or up to 6 h).
+    """
+
+    def get_retry_after(self, response):
+        seconds = super().get_retry_after(response)
+        if seconds is None:
+            return None
+        return min(seconds, HTTP_RETRY_AFTER_MAX)
+
+
+def _build_session() -> requests.Session:
+    retry = CappedRetry(
+        total=HTTP_RETRIES,
+        connect=HTTP_RETRIES,
+        read=HTTP_RETRIES,
+        status=HTTP_RETRIES,
+        backoff_factor=HTTP_BACKOFF,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_HOSTS,
+        pool_maxsize=HTTP_POOL_SIZE,
+        max_retries=retry,
+    )
+
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """
+    One pooled keep-alive session shared by every website-facing collector.
+    """
+    global _session
+    with _lock:
+        if _session is None:
+            _session = _build_session()
+    return _session
+
+
+def http_get(url: str, timeout: float = 20, **kwargs) -> requests.Response:
+    kwargs.setdefault("allow_redirects", True)
+    return get_session().get(url, timeout=timeout, **kwargs)
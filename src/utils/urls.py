@@ -0,0 +1,26 @@
+from urllib.parse import urlsplit, urlunsplit
+
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical form of a URL for cache keys and dedupe:
+    https by default, lowercase host, no default port, no fragment,
+    no trailing slash.
+    """
+    u = (url or "").strip()
+    if not u:
+        return ""
+    if "://" not in u:
+        u = "https://" + u
+
+    parts = urlsplit(u)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+
+    port = parts.port
+    if port and not ((scheme == "http" and port == 80) or (scheme == "https" and port == 443)):
+        host = f"{host}:{port}"
+
+    path = parts.path.rstrip("/")
+
+    return urlunsplit((scheme, host, path, parts.query, ""))